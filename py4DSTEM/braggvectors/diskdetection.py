@@ -1,16 +1,25 @@
 # Functions for finding Bragg scattering by cross correlative template matching
 # with a vacuum probe.
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import numpy as np
+import scipy.fft as sp_fft
 from scipy.ndimage import gaussian_filter
+from tqdm import tqdm
 
-from emdfile import tqdmnd
+from emdfile import PointList, tqdmnd
 from py4DSTEM import is_package_lite
 from py4DSTEM.braggvectors.braggvectors import BraggVectors
 from py4DSTEM.data import QPoints
 from py4DSTEM.datacube import DataCube
 from py4DSTEM.preprocess.utils import get_maxima_2D
-from py4DSTEM.process.utils.cross_correlate import get_cross_correlation_FT
+from py4DSTEM.process.utils.cross_correlate import (
+    _hybrid_correlation,
+    get_cross_correlation_FT,
+)
 
 try:
     from py4DSTEM.braggvectors.diskdetection_aiml import find_Bragg_disks_aiml
@@ -43,6 +52,7 @@ def find_Bragg_disks(
     ml_model_path=None,
     ml_num_attempts=1,
     ml_batch_size=8,
+    num_threads=None,
 ):
     """
     Finds the Bragg disks in the diffraction patterns represented by `data` by
@@ -170,6 +180,10 @@ def find_Bragg_disks(
                 processing
         if distributed is None, which is the default, processing will be in
         serial
+    num_threads : int or None
+        for full DataCubes on the CPU, the number of threads used to find
+        and refine the maxima of each row's cross correlations in parallel.
+        If None, uses one thread per CPU core; 1 runs serially
 
     Returns
     -------
@@ -286,6 +300,8 @@ def find_Bragg_disks(
     # if radial background subtraction is requested, add to args
     if radial_bksb and mode == "dc_CPU":
         kws["radial_bksb"] = radial_bksb
+    if mode == "dc_CPU":
+        kws["num_threads"] = num_threads
 
     # run and return
     ans = fn(
@@ -328,7 +344,12 @@ def _find_Bragg_disks_single(
     maxNumPeaks=100,
     _return_cc=False,
     _template_space="real",
+    _DP_FT=None,
 ):
+    # `_DP_FT`, if passed, is the Fourier transform of DP after filtering and
+    # smoothing - the `rfft2` half-spectrum if the real FFT branch below is
+    # taken, otherwise the full `fft2` - and skips transforming DP here
+
     # apply filter function
     er = "filter_function must be callable"
     if filter_function:
@@ -338,6 +359,7 @@ def _find_Bragg_disks_single(
     # check for a template
     if template is None:
         cc = DP
+        cc_real = np.maximum(np.real(np.fft.ifft2(cc)), 0)
     else:
         # fourier transform the template
         assert _template_space in ("real", "fourier")
@@ -350,18 +372,35 @@ def _find_Bragg_disks_single(
         if sigma_dp > 0:
             DP = gaussian_filter(DP, sigma_dp)
 
-        # Compute cross correlation
-        # _returnval = 'fourier' if subpixel == 'multicorr' else 'real'
-        cc = get_cross_correlation_FT(
-            DP,
-            template_FT,
-            corrPower,
-            "fourier",
-        )
+        # Compute cross correlation. Unless the full complex correlation is
+        # needed (for multicorr, or to return it), use a real FFT
+        if subpixel != "multicorr" and not _return_cc and np.isrealobj(DP):
+            cc_rFT = _get_cross_correlation_FT_batched(
+                DP, _get_rFT(template_FT), corrPower, rfft=True, dps_FT=_DP_FT
+            )
+            cc_real = np.fft.irfft2(cc_rFT, s=template_FT.shape)
+            np.maximum(cc_real, 0, out=cc_real)
+            cc = None
+        else:
+            # _returnval = 'fourier' if subpixel == 'multicorr' else 'real'
+            cc = get_cross_correlation_FT(
+                DP,
+                template_FT,
+                corrPower,
+                "fourier",
+                ar_FT=_DP_FT,
+            )
+            # the spectrum of a real pattern's correlation is Hermitian, so
+            # the real-space correlation only needs its half-spectrum
+            if np.isrealobj(DP):
+                cc_real = np.fft.irfft2(_get_rFT(cc), s=cc.shape)
+            else:
+                cc_real = np.real(np.fft.ifft2(cc))
+            np.maximum(cc_real, 0, out=cc_real)
 
     # Get maxima
     maxima = get_maxima_2D(
-        np.maximum(np.real(np.fft.ifft2(cc)), 0),
+        cc_real,
         subpixel=subpixel,
         upsample_factor=upsample_factor,
         sigma=sigma_cc,
@@ -423,6 +462,25 @@ def _find_Bragg_disks_stack(
 ):
     ans = []
 
+    # Get the template's Fourier transform once for the whole stack, then
+    # preprocess and Fourier transform all the patterns with a batched FFT
+    dps_FT = None
+    if template is not None:
+        if _template_space == "real":
+            template = np.conj(np.fft.fft2(template))
+            _template_space = "fourier"
+
+        if filter_function:
+            assert callable(filter_function), "filter_function must be callable"
+            dp_stack = np.stack([filter_function(dp) for dp in dp_stack])
+        dp_stack = np.asarray(dp_stack, dtype=np.float64)
+        if sigma_dp > 0:
+            dp_stack = gaussian_filter(dp_stack, (0, sigma_dp, sigma_dp))
+        filter_function, sigma_dp = None, 0
+
+        fft2 = sp_fft.fft2 if subpixel == "multicorr" else sp_fft.rfft2
+        dps_FT = fft2(dp_stack, axes=(-2, -1), workers=-1)
+
     for idx in range(dp_stack.shape[0]):
         dp = dp_stack[idx, :, :]
         peaks = _find_Bragg_disks_single(
@@ -442,6 +500,7 @@ def _find_Bragg_disks_stack(
             maxNumPeaks=maxNumPeaks,
             _template_space=_template_space,
             _return_cc=False,
+            _DP_FT=None if dps_FT is None else dps_FT[idx],
         )
         ans.append(peaks)
 
@@ -467,35 +526,27 @@ def _find_Bragg_disks_CPU(
     edgeBoundary=20,
     maxNumPeaks=70,
     radial_bksb=False,
+    num_threads=None,
 ):
     # Make the BraggVectors instance
     braggvectors = BraggVectors(datacube.Rshape, datacube.Qshape)
 
-    # Get the template's Fourier Transform
-    probe_kernel_FT = np.conj(np.fft.fft2(probe)) if probe is not None else None
-
-    # Loop over all diffraction patterns
-    # Compute and populate BraggVectors data
-    for rx, ry in tqdmnd(
-        datacube.R_Nx,
-        datacube.R_Ny,
-        desc="Finding Bragg Disks",
-        unit="DP",
-        unit_scale=True,
-    ):
-        # Get a diffraction pattern
-
-        # without background subtraction
-        if not radial_bksb:
-            dp = datacube.data[rx, ry, :, :]
-        # and with
-        else:
-            dp = datacube.get_radial_bksb_dp(rx, ry)
+    # Get the template's Fourier Transform. Correlations are computed in
+    # single precision, which halves the memory traffic of the FFT and
+    # multiply steps; camera data and the subsequent peak fitting do not
+    # need more
+    probe_kernel_FT = (
+        np.conj(sp_fft.fft2(np.asarray(probe, dtype=np.float32)))
+        if probe is not None
+        else None
+    )
 
-        # Compute
-        peaks = _find_Bragg_disks_single(
-            dp,
-            template=probe_kernel_FT,
+    # Without a template there is no cross correlation to batch,
+    # so run pattern by pattern
+    if probe_kernel_FT is None:
+        find_peaks = partial(
+            _find_Bragg_disks_single,
+            template=None,
             filter_function=filter_function,
             corrPower=corrPower,
             sigma_dp=sigma_dp,
@@ -509,16 +560,185 @@ def _find_Bragg_disks_CPU(
             edgeBoundary=edgeBoundary,
             maxNumPeaks=maxNumPeaks,
             _return_cc=False,
-            _template_space="fourier",
         )
+        for rx, ry in tqdmnd(
+            datacube.R_Nx,
+            datacube.R_Ny,
+            desc="Finding Bragg Disks",
+            unit="DP",
+            unit_scale=True,
+        ):
+            dp = _get_dp(datacube, rx, ry, radial_bksb)
+            braggvectors._v_uncal[rx, ry] = find_peaks(dp)
+        return braggvectors
+
+    er = "filter_function must be callable"
+    if filter_function:
+        assert callable(filter_function), er
+
+    # The complex correlation is only needed for multicorr refinement;
+    # otherwise use real FFTs, which need half the work and memory
+    use_rfft = subpixel != "multicorr"
+    if use_rfft:
+        probe_kernel_FT = _get_rFT(probe_kernel_FT)
+
+    # Finds and refines the maxima of one cross correlation
+    get_maxima = partial(
+        _get_maxima_QPoints,
+        subpixel=subpixel,
+        upsample_factor=upsample_factor,
+        sigma=sigma_cc,
+        minAbsoluteIntensity=minAbsoluteIntensity,
+        minRelativeIntensity=minRelativeIntensity,
+        relativeToPeak=relativeToPeak,
+        minSpacing=minPeakSpacing,
+        edgeBoundary=edgeBoundary,
+        maxNumPeaks=maxNumPeaks,
+    )
 
-        # Populate data
-        braggvectors._v_uncal[rx, ry] = peaks
+    # Loop over rows of scan positions. For each row, the cross
+    # correlations of all its diffraction patterns are computed with a
+    # single batched FFT, and then maxima are found pattern by pattern,
+    # in parallel threads - the numpy/scipy filtering and upsampled DFT
+    # steps release the GIL
+    num_threads = os.cpu_count() if num_threads is None else num_threads
+    with ThreadPoolExecutor(max_workers=max(1, num_threads)) as executor, tqdm(
+        total=datacube.R_N,
+        desc="Finding Bragg Disks",
+        unit="DP",
+        unit_scale=True,
+    ) as pbar:
+        for rx in range(datacube.R_Nx):
+            # Get the row of diffraction patterns, and apply any filtering
+            dps = _get_dp_row(datacube, rx, radial_bksb)
+            if filter_function is not None:
+                dps = np.stack([filter_function(dp) for dp in dps])
+            dps = dps.astype(np.float32, copy=False)
+            if sigma_dp > 0:
+                dps = gaussian_filter(dps, (0, sigma_dp, sigma_dp))
+
+            # Compute the cross correlations
+            ccs_FT = _get_cross_correlation_FT_batched(
+                dps, probe_kernel_FT, corrPower, rfft=use_rfft
+            )
+            # with multicorr the full spectrum is kept for refinement, but
+            # as it is Hermitian the inverse only needs its half
+            ccs = sp_fft.irfft2(
+                ccs_FT if use_rfft else _get_rFT(ccs_FT),
+                s=dps.shape[-2:],
+                axes=(-2, -1),
+                workers=-1,
+            )
+            # clamp negative correlation values, in place
+            np.maximum(ccs, 0, out=ccs)
+
+            # Get maxima and populate data
+            row_peaks = executor.map(
+                get_maxima,
+                ccs,
+                [None] * datacube.R_Ny if use_rfft else ccs_FT,
+            )
+            for ry, peaks in enumerate(row_peaks):
+                braggvectors._v_uncal[rx, ry] = peaks
+
+            pbar.update(datacube.R_Ny)
 
     # Return
     return braggvectors
 
 
+def _get_maxima_QPoints(cc, cc_FT, **kwargs):
+    """
+    Returns the maxima of `cc` found with `get_maxima_2D(cc, _ar_FT=cc_FT,
+    **kwargs)`, as a QPoints instance
+    """
+    return QPoints(get_maxima_2D(cc, _ar_FT=cc_FT, **kwargs))
+
+
+def _add_maxima_to_PointList(peaks, maxima_x, maxima_y, maxima_int):
+    """
+    Adds the maxima (maxima_x, maxima_y, maxima_int) to the PointList `peaks`,
+    or to a new (qx, qy, intensity) PointList if `peaks` is None, populating a
+    single structured array with them, and returns the PointList
+    """
+    if peaks is None:
+        coords = [("qx", float), ("qy", float), ("intensity", float)]
+        data = np.zeros(len(maxima_x), dtype=coords)
+    else:
+        assert isinstance(peaks, PointList)
+        data = np.zeros(len(maxima_x), dtype=peaks.dtype)
+    for field, d in zip(data.dtype.names, (maxima_x, maxima_y, maxima_int)):
+        data[field] = d
+    if peaks is None:
+        peaks = PointList(data=data)
+    elif peaks.length == 0:
+        peaks.data = data
+    else:
+        peaks.data = np.append(peaks.data, data)
+    return peaks
+
+
+def _get_dp(datacube, rx, ry, radial_bksb=False):
+    """
+    Returns the diffraction pattern at (rx,ry), with radial background
+    subtraction if `radial_bksb` is True
+    """
+    if not radial_bksb:
+        return datacube.data[rx, ry, :, :]
+    return datacube.get_radial_bksb_dp(rx, ry)
+
+
+def _get_dp_row(datacube, rx, radial_bksb=False):
+    """
+    Returns the (R_Ny,Q_Nx,Q_Ny) stack of diffraction patterns in scan row `rx`,
+    with radial background subtraction if `radial_bksb` is True. Without
+    background subtraction the row is read as a single slab, so that
+    HDF5-backed data is read with one hyperslab selection per row rather
+    than one per pattern.
+    """
+    if radial_bksb:
+        return np.stack(
+            [datacube.get_radial_bksb_dp(rx, ry) for ry in range(datacube.R_Ny)]
+        )
+    data = datacube.data
+    if "h5py" in str(type(data)):
+        row = np.empty(data.shape[1:], dtype=data.dtype)
+        data.read_direct(row, np.s_[rx, :, :, :])
+        return row
+    return np.asarray(data[rx, :, :, :])
+
+
+def _get_cross_correlation_FT_batched(
+    dps, template_FT, corrPower=1, rfft=False, dps_FT=None
+):
+    """
+    Computes the Fourier space cross/phase/hybrid correlations of each
+    pattern in the stack `dps` (shape (N,Q_Nx,Q_Ny), or a single 2D pattern)
+    with `template_FT`, using a single multithreaded FFT over the stack.
+    Equivalent to calling `get_cross_correlation_FT(dp, template_FT,
+    corrPower, "fourier")` on each pattern.
+
+    If `rfft` is True, `dps` must be real, `template_FT` must be the
+    half-spectrum returned by `_get_rFT`, and the half-spectrum of the
+    correlations is returned, for use with `irfft2`.
+
+    If `dps_FT` is passed, it is used as the (r)FFT of `dps`.
+    """
+    if dps_FT is None:
+        fft2 = sp_fft.rfft2 if rfft else sp_fft.fft2
+        dps_FT = fft2(dps, axes=(-2, -1), workers=-1)
+    m = dps_FT * template_FT
+    return _hybrid_correlation(m, corrPower)
+
+
+def _get_rFT(template_FT):
+    """
+    Returns the half-spectrum of the full Fourier transform `template_FT` of a
+    real template (or stack of them), matching the layout of `np.fft.rfft2`
+    """
+    return template_FT[..., : template_FT.shape[-1] // 2 + 1]
+
+
 # CUDA - unbatched
 
 
@@ -8,10 +8,11 @@ from time import time
 
 from emdfile import tqdmnd
 from py4DSTEM.braggvectors.braggvectors import BraggVectors
-from emdfile import PointList, PointListArray
+from emdfile import PointListArray
 from py4DSTEM.data import QPoints
 from py4DSTEM.braggvectors.kernels import kernels
 from py4DSTEM.braggvectors.diskdetection_aiml import _get_latest_model
+from py4DSTEM.braggvectors.diskdetection import _add_maxima_to_PointList
 
 # from py4DSTEM.braggvectors.diskdetection import universal_threshold
 
@@ -387,12 +388,7 @@ def _find_Bragg_disks_aiml_single_DP_CUDA(
     )
 
     # Make peaks PointList
-    if peaks is None:
-        coords = [("qx", float), ("qy", float), ("intensity", float)]
-        peaks = PointList(coordinates=coords)
-    else:
-        assert isinstance(peaks, PointList)
-    peaks.add_data_by_field((maxima_x, maxima_y, maxima_int))
+    peaks = _add_maxima_to_PointList(peaks, maxima_x, maxima_y, maxima_int)
 
     return peaks
 
@@ -3,6 +3,8 @@ Functions for finding Braggdisks using cupy
 
 """
 
+from functools import partial
+
 import numpy as np
 
 import cupy as cp
@@ -12,8 +14,11 @@ from time import time
 import numba
 
 from emdfile import tqdmnd
-from py4DSTEM import PointList, PointListArray
+from py4DSTEM import PointListArray
 from py4DSTEM.braggvectors.kernels import kernels
+from py4DSTEM.braggvectors.diskdetection import _add_maxima_to_PointList
+
+hybrid_correlation = kernels["hybrid_correlation_complex64"]
 
 
 def find_Bragg_disks_CUDA(
@@ -125,6 +130,25 @@ def find_Bragg_disks_CUDA(
         blocks = (DP.shape[0],)
         threads = (DP.shape[1],)
 
+    # Bind the per-pattern arguments once
+    find_peaks = partial(
+        _find_Bragg_disks_single_DP_FK_CUDA,
+        corrPower=corrPower,
+        sigma=sigma,
+        edgeBoundary=edgeBoundary,
+        minRelativeIntensity=minRelativeIntensity,
+        minAbsoluteIntensity=minAbsoluteIntensity,
+        relativeToPeak=relativeToPeak,
+        minPeakSpacing=minPeakSpacing,
+        maxNumPeaks=maxNumPeaks,
+        subpixel=subpixel,
+        upsample_factor=upsample_factor,
+        filter_function=filter_function,
+        get_maximal_points=get_maximal_points,
+        blocks=blocks,
+        threads=threads,
+    )
+
     t0 = time()
     if batching:
         # compute the batch size based on available VRAM:
@@ -164,45 +188,45 @@ def find_Bragg_disks_CUDA(
                     dtype=cp.float32,
                 )
 
-            # Perform the FFT and multiplication by probe_kernel on the batched array
+            # Perform the FFT and multiplication by probe_kernel on the batched array,
+            # then the hybrid correlation combine and inverse FFT for the whole batch
             batched_crosscorr = (
-                cufft.fft2(batched_subcube, overwrite_x=True)
+                cufft.fft2(batched_subcube[:this_batch_size], overwrite_x=True)
                 * probe_kernel_FT[None, :, :]
             )
+            if corrPower != 1:
+                batched_crosscorr = hybrid_correlation(
+                    batched_crosscorr, cp.float32(corrPower)
+                )
+            # the spectra are Hermitian, so the real inverse transform only
+            # needs their half-spectra
+            batched_cc = cp.maximum(
+                cufft.irfft2(
+                    batched_crosscorr[..., : datacube.Q_Ny // 2 + 1],
+                    s=(datacube.Q_Nx, datacube.Q_Ny),
+                    axes=(-2, -1),
+                ),
+                0,
+            )
 
             # Iterate over the patterns in the batch and do the Bragg disk stuff
             for subbatch_idx in range(this_batch_size):
                 patt_idx = batch_idx * batch_size + subbatch_idx
                 rx, ry = np.unravel_index(patt_idx, (datacube.R_Nx, datacube.R_Ny))
 
-                subFFT = batched_crosscorr[subbatch_idx]
-                ccc = cp.abs(subFFT) ** corrPower * cp.exp(1j * cp.angle(subFFT))
-                cc = cp.maximum(cp.real(cp.fft.ifft2(ccc)), 0)
+                ccc = batched_crosscorr[subbatch_idx]
+                cc = batched_cc[subbatch_idx]
 
-                _find_Bragg_disks_single_DP_FK_CUDA(
+                find_peaks(
                     None,
                     None,
                     ccc=ccc,
                     cc=cc,
-                    corrPower=corrPower,
-                    sigma=sigma,
-                    edgeBoundary=edgeBoundary,
-                    minRelativeIntensity=minRelativeIntensity,
-                    minAbsoluteIntensity=minAbsoluteIntensity,
-                    relativeToPeak=relativeToPeak,
-                    minPeakSpacing=minPeakSpacing,
-                    maxNumPeaks=maxNumPeaks,
-                    subpixel=subpixel,
-                    upsample_factor=upsample_factor,
-                    filter_function=filter_function,
                     peaks=peaks.get_pointlist(rx, ry),
-                    get_maximal_points=get_maximal_points,
-                    blocks=blocks,
-                    threads=threads,
                 )
 
         # clean up
-        del batched_subcube, batched_crosscorr, subFFT, cc, ccc
+        del batched_subcube, batched_crosscorr, batched_cc, cc, ccc
         cp.get_default_memory_pool().free_all_blocks()
 
     else:
@@ -215,24 +239,10 @@ def find_Bragg_disks_CUDA(
             unit_scale=True,
         ):
             DP = datacube.data[Rx, Ry, :, :]
-            _find_Bragg_disks_single_DP_FK_CUDA(
+            find_peaks(
                 DP,
                 probe_kernel_FT,
-                corrPower=corrPower,
-                sigma=sigma,
-                edgeBoundary=edgeBoundary,
-                minRelativeIntensity=minRelativeIntensity,
-                minAbsoluteIntensity=minAbsoluteIntensity,
-                relativeToPeak=relativeToPeak,
-                minPeakSpacing=minPeakSpacing,
-                maxNumPeaks=maxNumPeaks,
-                subpixel=subpixel,
-                upsample_factor=upsample_factor,
-                filter_function=filter_function,
                 peaks=peaks.get_pointlist(Rx, Ry),
-                get_maximal_points=get_maximal_points,
-                blocks=blocks,
-                threads=threads,
             )
     t = time() - t0
     print(
@@ -364,10 +374,7 @@ def _find_Bragg_disks_single_DP_FK_CUDA(
     )
 
     # Make peaks PointList
-    if peaks is None:
-        coords = [("qx", float), ("qy", float), ("intensity", float)]
-        peaks = PointList(coordinates=coords)
-    peaks.add_data_by_field((maxima_x, maxima_y, maxima_int))
+    peaks = _add_maxima_to_PointList(peaks, maxima_x, maxima_y, maxima_int)
 
     if return_cc:
         return peaks, gaussian_filter(cc, sigma)
@@ -390,7 +397,12 @@ def get_cross_correlation_fk(ar, fourierkernel, corrPower=1, returnval="cc"):
         inverse transform.
     """
     m = cp.fft.fft2(ar) * fourierkernel
-    ccc = cp.abs(m) ** (corrPower) * cp.exp(1j * cp.angle(m))
+    if corrPower != 1:
+        ccc = hybrid_correlation(
+            m.astype(cp.complex64, copy=False), cp.float32(corrPower)
+        )
+    else:
+        ccc = m
     if returnval == "fourier":
         return ccc
     else:
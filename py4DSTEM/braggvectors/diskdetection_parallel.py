@@ -10,6 +10,8 @@ import dill
 # local
 import py4DSTEM
 from emdfile import PointListArray
+from py4DSTEM.braggvectors.diskdetection import _add_maxima_to_PointList
+from py4DSTEM.process.utils.cross_correlate import _hybrid_correlation
 
 
 def _find_Bragg_disks_single_DP_FK(
@@ -145,7 +147,7 @@ def _find_Bragg_disks_single_DP_FK(
     else:
         # Multicorr subpixel:
         m = numpy.fft.fft2(DP) * probe_kernel_FT
-        ccc = numpy.abs(m) ** corrPower * numpy.exp(1j * numpy.angle(m))
+        ccc = _hybrid_correlation(m, corrPower)
 
         cc = numpy.maximum(numpy.real(numpy.fft.ifft2(ccc)), 0)
 
@@ -177,12 +179,7 @@ def _find_Bragg_disks_single_DP_FK(
             maxima_y[ipeak] = subShift[1]
 
     # Make peaks PointList
-    if peaks is None:
-        coords = [("qx", float), ("qy", float), ("intensity", float)]
-        peaks = py4DSTEM.PointList(coordinates=coords)
-    else:
-        assert isinstance(peaks, py4DSTEM.PointList)
-    peaks.add_tuple_of_nparrays((maxima_x, maxima_y, maxima_int))
+    peaks = _add_maxima_to_PointList(peaks, maxima_x, maxima_y, maxima_int)
 
     if return_cc:
         return peaks, scipy.ndimage.filters.gaussian_filter(cc, sigma)
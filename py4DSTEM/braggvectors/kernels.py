@@ -95,3 +95,28 @@ void edge_boundary(bool *ar, const long long edgeBoundary,
 """
 
 kernels["edge_boundary"] = cp.RawKernel(edge_boundary, "edge_boundary")
+
+
+############################# hybrid_correlation ####################################
+
+"""
+Fused elementwise combine for the hybrid cross correlation,
+
+    ccc = |m|**corrPower * exp(1j*angle(m)) = m * |m|**(corrPower-1)
+
+computed in a single pass over the Fourier space array, without the
+intermediate abs/angle/exp arrays. Zero-magnitude entries give 0 (or 1 if
+corrPower is 0), as for the direct expression.
+"""
+
+kernels["hybrid_correlation_complex64"] = cp.ElementwiseKernel(
+    "complex64 m, float32 corrPower",
+    "complex64 ccc",
+    """
+    float mag = abs(m);
+    ccc = (mag > 0)
+        ? m * powf(mag, corrPower - 1.0f)
+        : complex<float>(corrPower == 0 ? 1 : 0, 0);
+    """,
+    "hybrid_correlation_complex64",
+)
@@ -1,7 +1,16 @@
 # Bragg peaks thresholding fns
 
+import sys
+
 import numpy as np
-from emdfile import tqdmnd, PointListArray
+from scipy.spatial import cKDTree
+from emdfile import PointListArray
+from tqdm import tqdm
+
+try:
+    import numba as nb
+except ImportError:
+    pass
 
 
 def threshold_Braggpeaks(
@@ -27,12 +36,9 @@ def threshold_Braggpeaks(
     assert all(
         [item in pointlistarray.dtype.fields for item in ["qx", "qy", "intensity"]]
     ), "pointlistarray must include the coordinates 'qx', 'qy', and 'intensity'."
-    for Rx, Ry in tqdmnd(
-        pointlistarray.shape[0],
-        pointlistarray.shape[1],
+    for Rx, Ry in _tqdm_scan(
+        pointlistarray.shape,
         desc="Thresholding Bragg disks",
-        unit="DP",
-        unit_scale=True,
     ):
         pointlist = pointlistarray.get_pointlist(Rx, Ry)
         pointlist.sort(coordinate="intensity", order="descending")
@@ -48,16 +54,12 @@ def threshold_Braggpeaks(
 
         # Remove peaks that are too close together
         if maxNumPeaks is not False:
-            r2 = minPeakSpacing**2
-            deletemask = np.zeros(pointlist.length, dtype=bool)
-            for i in range(pointlist.length):
-                if deletemask[i] == False:  # noqa: E712
-                    tooClose = (
-                        (pointlist.data["qx"] - pointlist.data["qx"][i]) ** 2
-                        + (pointlist.data["qy"] - pointlist.data["qy"][i]) ** 2
-                    ) < r2
-                    tooClose[: i + 1] = False
-                    deletemask[tooClose] = True
+            deletemask = _get_close_peaks_mask(
+                np.ascontiguousarray(pointlist.data["qx"], dtype=np.float64),
+                np.ascontiguousarray(pointlist.data["qy"], dtype=np.float64),
+                float(minPeakSpacing**2),
+                maxNumPeaks=maxNumPeaks,
+            )
             pointlist.remove_points(deletemask)
 
         # Keep only up to maxNumPeaks
@@ -119,12 +121,9 @@ def universal_threshold(
         _pointlistarray.name = pointlistarray.name + "_unithresh"
 
     HI_array = np.zeros((_pointlistarray.shape[0], _pointlistarray.shape[1]))
-    for Rx, Ry in tqdmnd(
-        _pointlistarray.shape[0],
-        _pointlistarray.shape[1],
+    for Rx, Ry in _tqdm_scan(
+        _pointlistarray.shape,
         desc="Thresholding Bragg disks",
-        unit="DP",
-        unit_scale=True,
     ):
         pointlist = _pointlistarray.get_pointlist(Rx, Ry)
         if pointlist.data.shape[0] == 0:
@@ -141,12 +140,9 @@ def universal_threshold(
     else:
         _thresh = thresh
 
-    for Rx, Ry in tqdmnd(
-        _pointlistarray.shape[0],
-        _pointlistarray.shape[1],
+    for Rx, Ry in _tqdm_scan(
+        _pointlistarray.shape,
         desc="Thresholding Bragg disks",
-        unit="DP",
-        unit_scale=True,
     ):
         pointlist = _pointlistarray.get_pointlist(Rx, Ry)
 
@@ -156,16 +152,12 @@ def universal_threshold(
 
         # Remove peaks that are too close together
         if maxNumPeaks is not False:
-            r2 = minPeakSpacing**2
-            deletemask = np.zeros(pointlist.length, dtype=bool)
-            for i in range(pointlist.length):
-                if deletemask[i] == False:  # noqa: E712
-                    tooClose = (
-                        (pointlist.data["qx"] - pointlist.data["qx"][i]) ** 2
-                        + (pointlist.data["qy"] - pointlist.data["qy"][i]) ** 2
-                    ) < r2
-                    tooClose[: i + 1] = False
-                    deletemask[tooClose] = True
+            deletemask = _get_close_peaks_mask(
+                np.ascontiguousarray(pointlist.data["qx"], dtype=np.float64),
+                np.ascontiguousarray(pointlist.data["qy"], dtype=np.float64),
+                float(minPeakSpacing**2),
+                maxNumPeaks=maxNumPeaks,
+            )
             pointlist.remove_points(deletemask)
 
         # Keep only up to maxNumPeaks
@@ -204,12 +196,9 @@ def get_pointlistarray_intensities(pointlistarray):
     ), "pointlistarray coords must include 'intensity'"
 
     first_pass = True
-    for Rx, Ry in tqdmnd(
-        pointlistarray.shape[0],
-        pointlistarray.shape[1],
+    for Rx, Ry in _tqdm_scan(
+        pointlistarray.shape,
         desc="Getting disk intensities",
-        unit="DP",
-        unit_scale=True,
     ):
         pointlist = pointlistarray.get_pointlist(Rx, Ry)
         for i in range(pointlist.length):
@@ -222,3 +211,124 @@ def get_pointlistarray_intensities(pointlistarray):
                 temp_array = np.reshape(temp_array, 1)
                 peak_intensities = np.append(peak_intensities, temp_array)
     return peak_intensities
+
+
+# ======= UTILITIES ======#
+
+
+def _tqdm_scan(shape, desc=None):
+    """
+    Iterates over all (Rx,Ry) positions of a scan with the given 2D `shape`,
+    like `tqdmnd`, but updates the progress bar once per scan row rather
+    than once per position.
+    """
+    with tqdm(total=shape[0] * shape[1], desc=desc, unit="DP", unit_scale=True) as pbar:
+        for Rx in range(shape[0]):
+            for Ry in range(shape[1]):
+                yield Rx, Ry
+            pbar.update(shape[1])
+
+
+if "numba" in sys.modules:
+
+    @nb.njit(cache=True)
+    def _get_close_peaks_mask_bruteforce(qx, qy, r2):
+        """
+        Given peak positions `qx`,`qy` sorted by descending intensity, returns
+        a boolean mask which is True for each peak lying within sqrt(`r2`) of
+        a brighter, non-deleted peak.
+        """
+        N = qx.shape[0]
+        deletemask = np.zeros(N, dtype=np.bool_)
+        for i in range(N):
+            if deletemask[i]:
+                continue
+            for j in range(i + 1, N):
+                if deletemask[j]:
+                    continue
+                if (qx[j] - qx[i]) ** 2 + (qy[j] - qy[i]) ** 2 < r2:
+                    deletemask[j] = True
+        return deletemask
+
+else:
+
+    def _get_close_peaks_mask_bruteforce(qx, qy, r2):
+        """
+        Given peak positions `qx`,`qy` sorted by descending intensity, returns
+        a boolean mask which is True for each peak lying within sqrt(`r2`) of
+        a brighter, non-deleted peak.
+        """
+        N = qx.shape[0]
+
+        # which dimmer peaks are too close to each peak, bit-packed by row so
+        # that each surviving peak updates the mask with one OR over N/8 bytes
+        tooClose = np.triu(
+            (qx[:, None] - qx[None, :]) ** 2 + (qy[:, None] - qy[None, :]) ** 2 < r2,
+            k=1,
+        )
+        tooClose = np.packbits(tooClose, axis=1)
+
+        deletemask = np.zeros(tooClose.shape[1], dtype=np.uint8)
+        for i in range(N):
+            if not (deletemask[i >> 3] >> (7 - (i & 7))) & 1:
+                deletemask |= tooClose[i]
+        return np.unpackbits(deletemask, count=N).astype(bool)
+
+
+# Above this many peaks, spacing is checked with a KD-tree rather than by
+# comparing all pairs
+_KDTREE_MIN_PEAKS = 256
+
+
+def _get_close_peaks_mask(qx, qy, r2, maxNumPeaks=None):
+    """
+    Given peak positions `qx`,`qy` sorted by descending intensity, returns
+    a boolean mask which is True for each peak lying within sqrt(`r2`) of
+    a brighter, non-deleted peak. If `maxNumPeaks` is passed, the mask is
+    also True for all peaks after the `maxNumPeaks`'th surviving peak.
+    """
+    N = qx.shape[0]
+    if maxNumPeaks is None or maxNumPeaks >= N:
+        return _get_close_peaks_mask_all(qx, qy, r2)
+
+    # whether a peak is deleted depends only on brighter peaks, so only
+    # the brightest peaks need checking - enough of them to find
+    # maxNumPeaks survivors
+    K = min(N, 2 * maxNumPeaks)
+    while True:
+        mask = _get_close_peaks_mask_all(qx[:K], qy[:K], r2)
+        if K == N or np.count_nonzero(~mask) >= maxNumPeaks:
+            break
+        K = min(N, 2 * K)
+    deletemask = np.ones(N, dtype=bool)
+    deletemask[:K] = mask
+    deletemask[np.nonzero(~deletemask)[0][maxNumPeaks:]] = True
+    return deletemask
+
+
+def _get_close_peaks_mask_all(qx, qy, r2):
+    """
+    Implements `_get_close_peaks_mask` without truncation, using an all-pairs
+    check for short lists and a KD-tree for long ones.
+    """
+    N = qx.shape[0]
+    if N < _KDTREE_MIN_PEAKS or r2 <= 0:
+        return _get_close_peaks_mask_bruteforce(qx, qy, r2)
+
+    # find all pairs (i<j) closer than the minimum spacing
+    pairs = cKDTree(np.column_stack((qx, qy))).query_pairs(
+        np.sqrt(r2), output_type="ndarray"
+    )
+    d2 = (qx[pairs[:, 0]] - qx[pairs[:, 1]]) ** 2 + (
+        qy[pairs[:, 0]] - qy[pairs[:, 1]]
+    ) ** 2
+    pairs = pairs[d2 < r2]
+    pairs = pairs[np.argsort(pairs[:, 0], kind="stable")]
+
+    # in order of descending intensity, each surviving peak deletes its
+    # dimmer neighbors
+    deletemask = np.zeros(N, dtype=bool)
+    for i, j in pairs:
+        if not deletemask[i]:
+            deletemask[j] = True
+    return deletemask
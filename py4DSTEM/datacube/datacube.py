@@ -737,6 +737,7 @@ class DataCube(
         ml_batch_size=8,
         name="braggvectors",
         returncalc=True,
+        num_threads=None,
     ):
         """
         Finds the Bragg disks in the diffraction patterns represented by `data` by
@@ -869,6 +870,10 @@ class DataCube(
             name for the output BraggVectors
         returncalc : bool
             if True, returns the answer
+        num_threads : int or None
+            for full DataCubes on the CPU, the number of threads used to find
+            and refine the maxima of each row's cross correlations in parallel.
+            If None, uses one thread per CPU core; 1 runs serially
 
         Returns
         -------
@@ -915,6 +920,7 @@ class DataCube(
             ml_model_path=ml_model_path,
             ml_num_attempts=ml_num_attempts,
             ml_batch_size=ml_batch_size,
+            num_threads=num_threads,
         )
 
         if isinstance(peaks, Node):
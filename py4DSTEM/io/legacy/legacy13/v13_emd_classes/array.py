@@ -158,14 +158,25 @@ class Array:
         self.data = data
         self.name = name
         self.units = units
-        self.dims = dims
-        self.dim_names = dim_names
-        self.dim_units = dim_units
 
         self.tree = Tree()
         if not hasattr(self, "_metadata"):
             self._metadata = {}
 
+        # fast path for plain arrays with no dims, names, or units passed
+        if (
+            slicelabels is None
+            and dims is None
+            and dim_names is None
+            and dim_units is None
+        ):
+            self._fast_init()
+            return
+
+        self.dims = dims
+        self.dim_names = dim_names
+        self.dim_units = dim_units
+
         ## Handle array stacks
 
         if slicelabels is None:
@@ -178,100 +189,73 @@ class Array:
             if slicelabels is True:
                 slicelabels = [f"array{i}" for i in range(self.depth)]
             elif len(slicelabels) < self.depth:
-                slicelabels = np.concatenate(
-                    (
-                        slicelabels,
-                        [f"array{i}" for i in range(len(slicelabels), self.depth)],
-                    )
-                )
+                slicelabels = [
+                    *map(str, slicelabels),
+                    *(f"array{i}" for i in range(len(slicelabels), self.depth)),
+                ]
             else:
-                slicelabels = slicelabels[: self.depth]
+                slicelabels = [str(label) for label in slicelabels[: self.depth]]
             slicelabels = Labels(slicelabels)
 
         self.slicelabels = slicelabels
 
         ## Set dim vectors
 
-        dim_in_pixels = np.zeros(
-            self.rank, dtype=bool
-        )  # flag to help assign dim names and units
-        # if none were passed
-        if self.dims is None:
-            self.dims = [self._unpack_dim(1, self.shape[n]) for n in range(self.rank)]
-            dim_in_pixels[:] = True
-
-        # if some but not all were passed
-        elif len(self.dims) < self.rank:
-            _dims = self.dims
-            N = len(_dims)
-            self.dims = []
-            for n in range(N):
-                dim = self._unpack_dim(_dims[n], self.shape[n])
-                self.dims.append(dim)
-            for n in range(N, self.rank):
-                self.dims.append(self._unpack_dim(1, self.shape[n]))
-                dim_in_pixels[n] = True
-
-        # if all were passed
-        elif len(self.dims) == self.rank:
-            _dims = self.dims
-            self.dims = []
-            for n in range(self.rank):
-                dim = self._unpack_dim(_dims[n], self.shape[n])
-                self.dims.append(dim)
-
-        # otherwise
-        else:
+        shape = self.shape
+        rank = self.rank
+        _dims = [] if self.dims is None else self.dims
+        N = len(_dims)
+        if N > rank:
             raise Exception(
-                f"too many dim vectors were passed - expected {self.rank}, received {len(self.dims)}"
+                f"too many dim vectors were passed - expected {rank}, received {N}"
             )
+        # dims which aren't passed are populated with integer pixel values
+        self.dims = Dims(
+            self._pack_dim(_dims[n], shape[n]) if n < N else LinearDim(0, 1, shape[n])
+            for n in range(rank)
+        )
+        dim_in_pixels = [n >= N for n in range(rank)]
 
-        ## set dim vector names
-
-        # if none were passed
-        if self.dim_names is None:
-            self.dim_names = [f"dim{n}" for n in range(self.rank)]
+        # linearity of each dim vector, computed lazily by _dim_is_linear
+        self._dim_is_linear_cache = [None] * rank
 
-        # if some but not all were passed
-        elif len(self.dim_names) < self.rank:
-            N = len(self.dim_names)
-            self.dim_names = [name for name in self.dim_names] + [
-                f"dim{n}" for n in range(N, self.rank)
-            ]
-
-        # if all were passed
-        elif len(self.dim_names) == self.rank:
-            pass
+        ## set dim vector names
 
-        # otherwise
-        else:
+        _dim_names = [] if self.dim_names is None else self.dim_names
+        N = len(_dim_names)
+        if N > rank:
             raise Exception(
-                f"too many dim names were passed - expected {self.rank}, received {len(self.dim_names)}"
+                f"too many dim names were passed - expected {rank}, received {N}"
             )
+        self.dim_names = [_dim_names[n] if n < N else f"dim{n}" for n in range(rank)]
 
         ## set dim vector units
 
-        # if none were passed
-        if self.dim_units is None:
-            self.dim_units = [["unknown", "pixels"][int(i)] for i in dim_in_pixels]
-
-        # if some but not all were passed
-        elif len(self.dim_units) < self.rank:
-            N = len(self.dim_units)
-            self.dim_units = [units for units in self.dim_units] + [
-                ["unknown", "pixels"][int(dim_in_pixels[i])]
-                for i in range(N, self.rank)
-            ]
-
-        # if all were passed
-        elif len(self.dim_units) == self.rank:
-            pass
-
-        # otherwise
-        else:
+        _dim_units = [] if self.dim_units is None else self.dim_units
+        N = len(_dim_units)
+        if N > rank:
             raise Exception(
-                f"too many dim units were passed - expected {self.rank}, received {len(self.dim_units)}"
+                f"too many dim units were passed - expected {rank}, received {N}"
             )
+        self.dim_units = [
+            _dim_units[n] if n < N else ["unknown", "pixels"][dim_in_pixels[n]]
+            for n in range(rank)
+        ]
+
+    def _fast_init(self):
+        """
+        Populates the stack flag and the dim vectors, names, and units for a
+        non-stack Array for which none of these were passed, skipping the
+        general normalization logic in __init__
+        """
+        self.is_stack = False
+        self.slicelabels = None
+        shape = self.data.shape
+        rank = len(shape)
+        self.dims = Dims(LinearDim(0, 1, length) for length in shape)
+        self.dim_names = [f"dim{n}" for n in range(rank)]
+        self.dim_units = ["pixels"] * rank
+        self._dim_is_linear_cache = [None] * rank
 
     # Shape properties
 
@@ -317,6 +301,56 @@ class Array:
         else:
             return self.data[x]
 
+    def read_region(self, key):
+        """
+        Reads the region `key` (a tuple of ints and/or slices) of the data.
+        For lazily loaded, chunked HDF5 data, the chunk-aligned bounding box
+        containing the region is read in a single `read_direct` call and the
+        region is then sliced from it in memory, which avoids many small
+        cross-chunk reads. For all other data this is the same as
+        `self.data[key]`.
+        Accepts:
+            key (tuple): ints and/or slices with step 1 or None
+        Returns:
+            (np.ndarray) the data in the region
+        """
+        dset = self.data
+        if not isinstance(key, tuple):
+            key = (key,)
+        if (
+            not isinstance(dset, h5py.Dataset)
+            or dset.chunks is None
+            or len(key) > dset.ndim
+            or not all(
+                isinstance(k, Number) or (isinstance(k, slice) and k.step in (None, 1))
+                for k in key
+            )
+        ):
+            return dset[key]
+        key = key + (slice(None),) * (dset.ndim - len(key))
+
+        bbox = []
+        inner = []
+        for k, length, chunk in zip(key, dset.shape, dset.chunks):
+            if isinstance(k, slice):
+                start, stop, _ = k.indices(length)
+                stop = max(start, stop)
+            else:
+                start = int(k) + length if k < 0 else int(k)
+                stop = start + 1
+            c_start = (start // chunk) * chunk
+            c_stop = min(length, -(-stop // chunk) * chunk)
+            bbox.append(slice(c_start, c_stop))
+            if isinstance(k, slice):
+                inner.append(slice(start - c_start, stop - c_start))
+            else:
+                inner.append(start - c_start)
+
+        out = np.empty([b.stop - b.start for b in bbox], dtype=dset.dtype)
+        if out.size > 0:
+            dset.read_direct(out, np.s_[tuple(bbox)])
+        return out[tuple(inner)]
+
     ## Dim vectors
 
     def set_dim(
@@ -340,8 +374,9 @@ class Array:
             name: (Optional, str):
         """
         length = self.shape[n]
-        _dim = self._unpack_dim(dim, length)
+        _dim = self._pack_dim(dim, length)
         self.dims[n] = _dim
+        self._dim_is_linear_cache[n] = None
         if units is not None:
             self.dim_units[n] = units
         if name is not None:
@@ -384,19 +419,54 @@ class Array:
             return dim
         elif N == 2:
             start, step = dim[0], dim[1] - dim[0]
-            stop = start + step * length
-            return np.arange(start, stop, step)
+            return start + step * np.arange(length, dtype=np.float64)
         else:
             raise Exception(
                 f"dim vector length must be either 2 or equal to the length of the corresponding array dimension; dim vector length was {dim} and the array dimension length was {length}"
             )
 
-    def _dim_is_linear(self, dim, length):
+    @classmethod
+    def _pack_dim(cls, dim, length):
+        """
+        As `_unpack_dim`, except that dims which are linear by construction
+        (a number, or a 2-element start/stop pair for a longer axis) are
+        returned as a `LinearDim` rather than being expanded.
+        """
+        if isinstance(dim, Number):
+            return LinearDim(0.0, float(dim), length)
+        if len(dim) == 2 and length != 2 and isinstance(dim[0], Number):
+            return LinearDim(float(dim[0]), float(dim[1] - dim[0]), length)
+        return cls._unpack_dim(dim, length)
+
+    def _dim_is_linear(self, n):
         """
-        Returns True if a dim is linear, else returns False
+        Returns True if the n'th dim vector is linear, else returns False.
+        The result is cached until the dim is reset with `set_dim`.
         """
-        dim_expanded = self._unpack_dim(dim[:2], length)
-        return np.array_equal(dim, dim_expanded)
+        if self.dims.get_linear(n) is not None:
+            return True
+        is_linear = self._dim_is_linear_cache[n]
+        if is_linear is None:
+            is_linear = self._check_dim_is_linear(self.dims[n], self.shape[n])
+            self._dim_is_linear_cache[n] = is_linear
+        return is_linear
+
+    @staticmethod
+    def _check_dim_is_linear(dim, length):
+        """
+        Returns True if a dim is linear, else returns False. Checks the
+        spacing between consecutive elements against the first step
+        rather than rebuilding the full linear vector.
+        """
+        if len(dim) != length:
+            return False
+        if length < 2:
+            return True
+        dim = np.asarray(dim)
+        step = dim[1] - dim[0]
+        d = np.diff(dim)
+        scale = max(1.0, abs(step), abs(dim[0]), abs(dim[-1]))
+        return bool(np.all(np.abs(d - step) < 1e-12 * scale))
 
     # set up metadata property
 
@@ -412,74 +482,160 @@ class Array:
     ## Representation to standard output
 
     def __repr__(self):
+        space = " " * len(self.__class__.__name__) + "  "
         if not self.is_stack:
-            space = " " * len(self.__class__.__name__) + "  "
-            string = f"{self.__class__.__name__}( A {self.rank}-dimensional array of shape {self.shape} called '{self.name}',"
-            string += "\n" + space + "with dimensions:"
-            string += "\n"
-            for n in range(self.rank):
-                # need to handle the edge case of only single value in dims i.e.line scans, 1,512,256,256
-                # check there is more than a single probe poistion
-                if self.dims[n].size < 2:
-                    string += (
-                        "\n"
-                        + space
-                        + f"    {self.dim_names[n]} = [{self.dims[n][0]}] {self.dim_units[n]}"
-                    )
-                else:
-                    string += (
-                        "\n"
-                        + space
-                        + f"    {self.dim_names[n]} = [{self.dims[n][0]},{self.dims[n][1]},...] {self.dim_units[n]}"
-                    )
-
+            lines = [
+                f"{self.__class__.__name__}( A {self.rank}-dimensional array of shape {self.shape} called '{self.name}',",
+                space + "with dimensions:",
+                "",
+            ]
+            lines.extend(self._repr_dims(space, show_linearity=False))
         else:
-            space = " " * len(self.__class__.__name__) + "  "
-            string = f"{self.__class__.__name__}( A stack of {self.depth} Arrays with {self.rank}-dimensions and shape {self.shape}, called '{self.name}'"
-            string += "\n"
-            string += "\n" + space + "The labels are:"
-            for label in self.slicelabels:
-                string += "\n" + space + f"    {label}"
-            string += "\n"
-            string += "\n"
-            string += "\n" + space + "The Array dimensions are:"
-            for n in range(self.rank):
-                # need to handle the edge case of only single value in dims i.e.line scans, 1,512,256,256
-                # check there is more than a single probe poistion
-                if self.dims[n].size < 2:
-                    string += (
-                        "\n"
-                        + space
-                        + f"    {self.dim_names[n]} = [{self.dims[n][0]}] {self.dim_units[n]}"
-                    )
-                else:
-                    string += (
-                        "\n"
-                        + space
-                        + f"    {self.dim_names[n]} = [{self.dims[n][0]},{self.dims[n][1]},...] {self.dim_units[n]}"
-                    )
-                if not self._dim_is_linear(self.dims[n], self.shape[n]):
-                    string += "  (*non-linear*)"
-            string += "\n)"
-
-        return string
+            lines = [
+                f"{self.__class__.__name__}( A stack of {self.depth} Arrays with {self.rank}-dimensions and shape {self.shape}, called '{self.name}'",
+                "",
+                space + "The labels are:",
+            ]
+            lines.extend(space + f"    {label}" for label in self.slicelabels)
+            lines.extend(["", "", space + "The Array dimensions are:"])
+            lines.extend(self._repr_dims(space, show_linearity=True))
+            lines[-1] += "\n)"
+
+        return "\n".join(lines)
+
+    def _repr_dims(self, space, show_linearity):
+        """
+        Returns a list of lines describing each dim vector, for __repr__
+        """
+        lines = []
+        for n in range(self.rank):
+            # need to handle the edge case of only single value in dims i.e.line scans, 1,512,256,256
+            # check there is more than a single probe poistion
+            dim = self.dims[n]
+            if dim.size < 2:
+                line = (
+                    space + f"    {self.dim_names[n]} = [{dim[0]}] {self.dim_units[n]}"
+                )
+            else:
+                line = (
+                    space
+                    + f"    {self.dim_names[n]} = [{dim[0]},{dim[1]},...] {self.dim_units[n]}"
+                )
+            if show_linearity and not self._dim_is_linear(n):
+                line += "  (*non-linear*)"
+            lines.append(line)
+        return lines
 
     # HDF5 read/write
 
-    def to_h5(self, group):
+    def to_h5(self, group, chunks=True, compression=None):
         from py4DSTEM.io.legacy.legacy13.v13_emd_classes.io import Array_to_h5
 
-        Array_to_h5(self, group)
+        Array_to_h5(self, group, chunks=chunks, compression=compression)
 
-    def from_h5(group):
+    def from_h5(group, lazy=False):
         from py4DSTEM.io.legacy.legacy13.v13_emd_classes.io import Array_from_h5
 
-        return Array_from_h5(group)
+        return Array_from_h5(group, lazy=lazy)
 
 
 ########### END OF CLASS ###########
 
 
+# Compact representation of a linear dim vector, which is expanded into a full
+# vector once, when first accessed. The vector is read-only, so that the dim
+# stays linear; use `Array.set_dim` to change it
+class LinearDim:
+    __slots__ = ("start", "step", "length", "_vector")
+
+    def __init__(self, start, step, length):
+        self.start = start
+        self.step = step
+        self.length = length
+        self._vector = None
+
+    def __repr__(self):
+        return f"LinearDim(start={self.start}, step={self.step}, length={self.length})"
+
+    def expand(self):
+        if self._vector is None:
+            self._vector = self.start + self.step * np.arange(self.length)
+            self._vector.setflags(write=False)
+        return self._vector
+
+
+# List subclass holding dim vectors, in which linear dims may be stored as a
+# LinearDim and are only expanded into full vectors when accessed. Methods
+# returning or comparing elements are overridden so that they use the expanded
+# vectors, and methods returning new lists return Dims
+class Dims(list):
+    def __repr__(self):
+        return repr(list(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __contains__(self, dim):
+        return dim in list(self)
+
+    def index(self, dim, *args):
+        return list(self).index(dim, *args)
+
+    def count(self, dim):
+        return list(self).count(dim)
+
+    def remove(self, dim):
+        del self[self.index(dim)]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._expand(dim) for dim in list.__getitem__(self, idx)]
+        return self._expand(list.__getitem__(self, idx))
+
+    def __iter__(self):
+        for dim in list.__iter__(self):
+            yield self._expand(dim)
+
+    def __reversed__(self):
+        for dim in list.__reversed__(self):
+            yield self._expand(dim)
+
+    def __add__(self, other):
+        return Dims(list.__add__(self, list(other)))
+
+    def __radd__(self, other):
+        return Dims(list.__add__(list(other), list.copy(self)))
+
+    def __mul__(self, n):
+        return Dims(list.__mul__(self, n))
+
+    __rmul__ = __mul__
+
+    def copy(self):
+        return Dims(list.copy(self))
+
+    def pop(self, idx=-1):
+        return self._expand(list.pop(self, idx))
+
+    def get_linear(self, n):
+        """
+        Returns the LinearDim for the n'th dim if it is stored compactly,
+        otherwise None
+        """
+        dim = list.__getitem__(self, n)
+        return dim if isinstance(dim, LinearDim) else None
+
+    @staticmethod
+    def _expand(dim):
+        return dim.expand() if isinstance(dim, LinearDim) else dim
+
+
 # List subclass for accessing data slices with a dict
 class Labels(list):
     def __init__(self, x=[]):
@@ -488,8 +644,11 @@ class Labels(list):
 
     def __setitem__(self, idx, label):
         label_old = self[idx]
-        del self._dict[label_old]
         list.__setitem__(self, idx, label)
+        # _dict holds non-negative indices
+        idx %= len(self)
+        if self._dict.get(label_old) == idx:
+            self._dict.pop(label_old, None)
         self._dict[label] = idx
 
     def setup_labels_dict(self):
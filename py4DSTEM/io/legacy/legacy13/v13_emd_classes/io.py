@@ -3,6 +3,7 @@
 
 import numpy as np
 import h5py
+from collections.abc import Mapping
 from numbers import Number
 from emdfile import tqdmnd
 
@@ -32,8 +33,11 @@ def find_EMD_groups(group: h5py.Group, emd_group_type):
         group (HDF5 group):
         emd_group_type (int)
     """
-    keys = [k for k in group.keys() if "emd_group_type" in group[k].attrs.keys()]
-    return [k for k in keys if group[k].attrs["emd_group_type"] == emd_group_type]
+    return [
+        k
+        for k, obj in group.items()
+        if obj.attrs.get("emd_group_type", None) == emd_group_type
+    ]
 
 
 def EMD_group_exists(group: h5py.Group, emd_group_type, name: str):
@@ -48,13 +52,10 @@ def EMD_group_exists(group: h5py.Group, emd_group_type, name: str):
     Returns:
         bool
     """
-    if name in group.keys():
-        if "emd_group_type" in group[name].attrs.keys():
-            if group[name].attrs["emd_group_type"] == emd_group_type:
-                return True
-            return False
+    obj = group.get(name, None)
+    if obj is None:
         return False
-    return False
+    return bool(obj.attrs.get("emd_group_type", None) == emd_group_type)
 
 
 # Read and write for base EMD types
@@ -341,27 +342,55 @@ def Metadata_from_h5(group: h5py.Group):
 # write
 
 
-def Array_to_h5(array, group):
+def Array_to_h5(array, group, chunks=True, compression=None):
     """
     Takes a valid HDF5 group for an HDF5 file object which is open in
     write or append mode. Writes a new group with a name given by this
     Array's .name field nested inside the passed group, and saves the
-    data there.
+    data there. When writing many Arrays to one file, opening it with
+    `h5py.File(path, 'a', libver='latest')` uses the newer, more compact
+    group and attribute storage and reduces per-object metadata overhead.
     Accepts:
         group (HDF5 group)
+        chunks (True, None, or tuple): chunk shape for the data. If True,
+            uses `_get_default_chunks`, which keeps the last two axes (or for a
+            stack, the two before the label axis) whole and grows along the
+            remaining axes up to ~1 MB per chunk. If None, the data is stored
+            contiguously.
+        compression (None, str, or mapping): an h5py compression filter
+            (e.g. 'lzf' or 'gzip') or an hdf5plugin filter instance
+            (e.g. hdf5plugin.Blosc2()). If None, no compression is used.
     """
 
     ## Write
 
-    grp = group.create_group(array.name)
-    grp.attrs.create("emd_group_type", 1)  # this tag indicates an Array
-    grp.attrs.create("py4dstem_class", array.__class__.__name__)
+    grp = group.create_group(array.name, track_order=False)
+    grp.attrs.update(
+        {
+            "emd_group_type": 1,  # this tag indicates an Array
+            "py4dstem_class": array.__class__.__name__,
+        }
+    )
+
+    # set chunking and compression
+    if chunks is True:
+        chunks = _get_default_chunks(
+            array.data.shape, array.data.dtype, is_stack=array.is_stack
+        )
+    if isinstance(compression, Mapping):
+        filter_kwargs = dict(compression)
+    elif compression is not None:
+        filter_kwargs = {"compression": compression}
+    else:
+        filter_kwargs = {}
 
     # add the data
     data = grp.create_dataset(
         "data",
         shape=array.data.shape,
         data=array.data,
+        chunks=chunks,
+        **filter_kwargs,
         # dtype = type(array.data)
     )
     data.attrs.create(
@@ -371,25 +400,28 @@ def Array_to_h5(array, group):
     # Add the normal dim vectors
     for n in range(array.rank):
         # unpack info
-        dim = array.dims[n]
         name = array.dim_names[n]
         units = array.dim_units[n]
-        is_linear = array._dim_is_linear(dim, array.shape[n])
+        linear_dim = array.dims.get_linear(n)
 
-        # compress the dim vector if it's linear
-        if is_linear:
-            dim = dim[:2]
+        # compress the dim vector if it's linear. Dims which aren't stored
+        # compactly may have been edited in place, so their values are checked
+        if linear_dim is not None:
+            dim = [linear_dim.start, linear_dim.start + linear_dim.step]
+        else:
+            dim = array.dims[n]
+            if array._check_dim_is_linear(dim, array.shape[n]):
+                dim = dim[:2]
 
         # write
         dset = grp.create_dataset(f"dim{n}", data=dim)
-        dset.attrs.create("name", name)
-        dset.attrs.create("units", units)
+        dset.attrs.update({"name": name, "units": units})
 
     # Add stack dim vector, if present
     if array.is_stack:
         n = array.rank
         name = "_labels_"
-        dim = [s.encode("utf-8") for s in array.slicelabels]
+        dim = np.asarray(array.slicelabels, dtype=h5py.string_dtype())
 
         # write
         dset = grp.create_dataset(f"dim{n}", data=dim)
@@ -399,16 +431,53 @@ def Array_to_h5(array, group):
     _write_metadata(array, grp)
 
 
+def _get_default_chunks(shape, dtype, target_bytes=2**20, is_stack=False):
+    """
+    Returns a chunk shape for an array of `shape` and `dtype`. Arrays of
+    rank <= 2 use h5py's automatic chunking. For rank >= 3 the last two
+    axes (i.e. a full diffraction pattern or image) are kept whole, and
+    the chunk is extended along the preceding axes, fastest first, until
+    it reaches ~`target_bytes`. If `is_stack`, the last axis is the label
+    axis, so the two axes before it are kept whole instead, and the chunk is
+    extended along the label axis first. Empty and scalar arrays are not
+    chunked.
+    """
+    shape = tuple(shape)
+    if len(shape) == 0 or np.prod(shape) == 0:
+        return None
+    if len(shape) <= 2:
+        return True
+    if is_stack:
+        # move the label axis in front of the image axes, and back again
+        chunks = _get_default_chunks(
+            shape[:-3] + shape[-1:] + shape[-3:-1], dtype, target_bytes
+        )
+        return chunks[:-3] + chunks[-2:] + chunks[-3:-2]
+    chunks = [1] * (len(shape) - 2) + list(shape[-2:])
+    nbytes = np.dtype(dtype).itemsize * shape[-2] * shape[-1]
+    for ax in range(len(shape) - 3, -1, -1):
+        chunks[ax] = int(min(shape[ax], max(1, target_bytes // nbytes)))
+        nbytes *= chunks[ax]
+        if chunks[ax] < shape[ax]:
+            break
+    return tuple(chunks)
+
+
 ## read
 
 
-def Array_from_h5(group: h5py.Group):
+def Array_from_h5(group: h5py.Group, lazy: bool = False):
     """
     Takes a valid HDF5 group for an HDF5 file object which is open in read mode.
     Determines if this group represents an Array object and if it does, loads
     returns it. If it doesn't, raises an exception.
     Accepts:
         group (HDF5 group)
+        lazy (bool): if True, the data is not read into memory. Contiguous,
+            uncompressed datasets are memory-mapped with np.memmap; otherwise
+            the h5py.Dataset itself is used as the data, which supports
+            numpy-style slicing but not in-place operations, and which is only
+            valid while the file remains open.
     Returns:
         An Array instance
     """
@@ -421,13 +490,20 @@ def Array_from_h5(group: h5py.Group):
 
     # get data
     dset = group["data"]
-    data = dset[:]
-    units = dset.attrs["units"]
+    if lazy:
+        data = _get_lazy_data(dset)
+    else:
+        data = np.empty(dset.shape, dtype=dset.dtype)
+        if data.size > 0:
+            dset.read_direct(data)
+    data_attrs = dict(dset.attrs)
+    units = data_attrs["units"]
     rank = len(data.shape)
 
     # determine if this is a stack array
     last_dim = group[f"dim{rank-1}"]
-    if last_dim.attrs["name"] == "_labels_":
+    last_dim_attrs = dict(last_dim.attrs)
+    if last_dim_attrs["name"] == "_labels_":
         is_stack = True
         normal_dims = rank - 1
     else:
@@ -440,14 +516,17 @@ def Array_from_h5(group: h5py.Group):
     dim_names = []
     for n in range(normal_dims):
         dim_dset = group[f"dim{n}"]
+        attrs = dict(dim_dset.attrs)
         dims.append(dim_dset[:])
-        dim_units.append(dim_dset.attrs["units"])
-        dim_names.append(dim_dset.attrs["name"])
+        dim_units.append(attrs["units"])
+        dim_names.append(attrs["name"])
 
     # if it's a stack array, get the labels
     if is_stack:
-        slicelabels = last_dim[:]
-        slicelabels = [s.decode("utf-8") for s in slicelabels]
+        if last_dim.dtype.kind == "S":
+            slicelabels = np.char.decode(last_dim[:], "utf-8").tolist()
+        else:
+            slicelabels = last_dim.asstr()[:].tolist()
     else:
         slicelabels = None
 
@@ -462,12 +541,34 @@ def Array_from_h5(group: h5py.Group):
         slicelabels=slicelabels,
     )
 
+    # keep a reference to the file for h5py-backed lazy data
+    if isinstance(data, h5py.Dataset):
+        ar._h5file = dset.file
+
     # add metadata
     _read_metadata(ar, group)
 
     return ar
 
 
+def _get_lazy_data(dset):
+    """
+    Returns an np.memmap of `dset` if it is stored contiguously and without
+    filters, so that reads bypass h5py and are paged in by the OS. Otherwise
+    returns the h5py.Dataset.
+    """
+    offset = dset.id.get_offset()
+    if dset.chunks is None and dset.compression is None and offset is not None:
+        return np.memmap(
+            dset.file.filename,
+            mode="r",
+            dtype=dset.dtype,
+            offset=offset,
+            shape=dset.shape,
+        )
+    return dset
+
+
 ## POINTLIST
 
 
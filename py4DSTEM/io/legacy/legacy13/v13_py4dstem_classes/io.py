@@ -221,18 +221,16 @@ def VirtualDiffraction_from_Array(array):
     assert array.rank == 2, "Array must have 2 dimensions"
 
     # get diffraction image metadata
-    try:
-        md = array.metadata["virtualdiffraction"]
-        method = md["method"]
-        mode = md["mode"]
-        geometry = md["geometry"]
-        shift_center = md["shift_center"]
-    except KeyError:
+    md = array.metadata.get("virtualdiffraction", None)
+    if md is None:
         print("Warning: VirtualDiffraction metadata could not be found")
-        method = ""
-        mode = ""
-        geometry = ""
-        shift_center = ""
+        keys = ()
+    else:
+        keys = md.keys
+    method = md["method"] if "method" in keys else ""
+    mode = md["mode"] if "mode" in keys else ""
+    geometry = md["geometry"] if "geometry" in keys else ""
+    shift_center = md["shift_center"] if "shift_center" in keys else ""
 
     # instantiate as a DiffractionImage
     array.__class__ = VirtualDiffraction
@@ -286,10 +284,10 @@ def VirtualImage_from_Array(array):
         md = array.metadata["virtualimage"]
         mode = md["mode"]
         geo = md["geometry"]
-        centered = md._params.get("centered", None)
-        calibrated = md._params.get("calibrated", None)
-        shift_center = md._params.get("shift_center", None)
-        dask = md._params.get("dask", None)
+        centered = md["centered"] if "centered" in md.keys else None
+        calibrated = md["calibrated"] if "calibrated" in md.keys else None
+        shift_center = md["shift_center"] if "shift_center" in md.keys else None
+        dask = md["dask"] if "dask" in md.keys else None
     except KeyError:
         er = "VirtualImage metadata could not be found"
         raise Exception(er)
@@ -1,7 +1,8 @@
 # Preprocessing utility functions
 
 import numpy as np
-from scipy.ndimage import gaussian_filter
+from scipy.ndimage import gaussian_filter, label, maximum_filter
+from scipy.signal import lfilter, lfilter_zi
 
 try:
     import cupy as cp
@@ -120,6 +121,117 @@ def get_shifted_ar(ar, xshift, yshift, periodic=True, bilinear=False, device="cp
     return shifted_ar
 
 
+def _center_plateau_maxima(ar, maxima_bool, maxima_x, maxima_y):
+    """
+    Moves each maximum lying on a multi-pixel plateau to the plateau pixel
+    nearest the plateau's centroid. The tie-break in get_maxima_2D keeps one
+    pixel per plateau, at its corner; plateaus are found here with a single
+    connected-components pass over the candidate mask, which is only run if
+    some maximum has an equal-valued neighbor.
+    """
+    val = ar[maxima_x, maxima_y]
+    on_plateau = np.zeros(len(maxima_x), dtype=bool)
+    neighbors = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+    for dx, dy in neighbors:
+        on_plateau |= ar[maxima_x + dx, maxima_y + dy] == val
+    if not np.any(on_plateau):
+        return maxima_x, maxima_y
+
+    # adjacent candidates are equal-valued, so components of the candidate
+    # mask are the plateaus
+    labels, _ = label(maxima_bool, structure=np.ones((3, 3), dtype=bool))
+    maxima_x, maxima_y = maxima_x.copy(), maxima_y.copy()
+    for i in np.nonzero(on_plateau)[0]:
+        xs, ys = np.nonzero(labels == labels[maxima_x[i], maxima_y[i]])
+        j = np.argmin((xs - xs.mean()) ** 2 + (ys - ys.mean()) ** 2)
+        maxima_x[i], maxima_y[i] = xs[j], ys[j]
+    return maxima_x, maxima_y
+
+
+# The recursive gaussian is only faster than gaussian_filter for large arrays
+# and large sigma (measured ~1.2-2x at 512x512 and above for sigma >= 12), so
+# smaller smoothing steps keep the exact FIR filter
+_RECURSIVE_GAUSSIAN_MIN_SIGMA = 12
+_RECURSIVE_GAUSSIAN_MIN_SIZE = 512 * 512
+
+
+def _gaussian_filter_2D(ar, sigma):
+    """
+    Gaussian smoothing of a 2D array, using `gaussian_filter_recursive` for
+    large arrays and large `sigma` and `scipy.ndimage.gaussian_filter` otherwise
+    """
+    if (
+        np.isscalar(sigma)
+        and sigma >= _RECURSIVE_GAUSSIAN_MIN_SIGMA
+        and ar.size >= _RECURSIVE_GAUSSIAN_MIN_SIZE
+    ):
+        return gaussian_filter_recursive(ar, sigma)
+    return gaussian_filter(ar, sigma)
+
+
+def gaussian_filter_recursive(ar, sigma):
+    """
+    Gaussian smoothing of a 2D array using the fourth order recursive filter
+    of Deriche (INRIA Research Report 1893 (1993)). A causal and an
+    anti-causal IIR pass is applied along each axis, so the cost per pixel
+    is independent of `sigma`, and for large arrays and large `sigma` this is
+    faster than `scipy.ndimage.gaussian_filter`. Boundaries are handled by
+    reflection, matching `scipy.ndimage.gaussian_filter`'s default mode.
+    Accurate to within ~0.1% of the peak of the exact Gaussian for sigma >= 0.5.
+
+    Args:
+        ar (2D array): the array to smooth
+        sigma (number): the standard deviation of the Gaussian, in pixels
+
+    Returns:
+        (2D array) the smoothed array
+    """
+    assert sigma >= 0.5, "recursive gaussian requires sigma >= 0.5"
+
+    # filter coefficients
+    a0, a1, b0, b1 = 1.6800, 3.7350, 1.7830, 1.7230
+    w0, w1, c0, c1 = 0.6318, 1.9970, -0.6803, -0.2598
+    e0, e1 = np.exp(-b0 / sigma), np.exp(-b1 / sigma)
+    cw0, sw0 = np.cos(w0 / sigma), np.sin(w0 / sigma)
+    cw1, sw1 = np.cos(w1 / sigma), np.sin(w1 / sigma)
+
+    n0 = a0 + c0
+    n1 = e1 * (c1 * sw1 - (c0 + 2 * a0) * cw1) + e0 * (a1 * sw0 - (2 * c0 + a0) * cw0)
+    n2 = (
+        2 * e0 * e1 * ((a0 + c0) * cw1 * cw0 - a1 * cw1 * sw0 - c1 * cw0 * sw1)
+        + c0 * e0**2
+        + a0 * e1**2
+    )
+    n3 = e1 * e0**2 * (c1 * sw1 - c0 * cw1) + e0 * e1**2 * (a1 * sw0 - a0 * cw0)
+    d1 = -2 * e1 * cw1 - 2 * e0 * cw0
+    d2 = 4 * cw1 * cw0 * e0 * e1 + e1**2 + e0**2
+    d3 = -2 * cw0 * e0 * e1**2 - 2 * cw1 * e1 * e0**2
+    d4 = e0**2 * e1**2
+
+    a = np.array([1, d1, d2, d3, d4])
+    b_causal = np.array([n0, n1, n2, n3, 0])
+    b_anticausal = np.array([0, n1 - d1 * n0, n2 - d2 * n0, n3 - d3 * n0, -d4 * n0])
+    # normalize to unit gain
+    gain = (b_causal.sum() + b_anticausal.sum()) / a.sum()
+    b_causal /= gain
+    b_anticausal /= gain
+
+    # start each pass in the steady state of its first sample
+    zi_causal = lfilter_zi(b_causal, a)
+    zi_anticausal = lfilter_zi(b_anticausal, a)
+
+    # pad by reflection to suppress the filters' boundary transients
+    pad = int(np.ceil(4 * sigma))
+    out = np.pad(np.asarray(ar, dtype=np.float64), pad, mode="symmetric")
+    for axis in (0, 1):
+        x = np.moveaxis(out, axis, -1)
+        y_causal, _ = lfilter(b_causal, a, x, zi=zi_causal * x[..., :1])
+        x = x[..., ::-1]
+        y_anticausal, _ = lfilter(b_anticausal, a, x, zi=zi_anticausal * x[..., :1])
+        out = np.moveaxis(y_causal + y_anticausal[..., ::-1], -1, axis)
+    return np.ascontiguousarray(out[pad:-pad, pad:-pad])
+
+
 def get_maxima_2D(
     ar,
     subpixel="poly",
@@ -156,26 +268,18 @@ def get_maxima_2D(
     Returns:
         a structured array with fields 'x','y','intensity'
     """
-    from py4DSTEM.process.utils.multicorr import upsampled_correlation
+    from py4DSTEM.process.utils.multicorr import upsampled_correlation_batched
 
     subpixel_modes = ("pixel", "poly", "multicorr")
     er = f"Unrecognized subpixel option {subpixel}. Must be in {subpixel_modes}"
     assert subpixel in subpixel_modes, er
 
     # gaussian filtering
-    ar = ar if sigma <= 0 else gaussian_filter(ar, sigma)
-
-    # local pixelwise maxima
-    maxima_bool = (
-        (ar >= np.roll(ar, (-1, 0), axis=(0, 1)))
-        & (ar > np.roll(ar, (1, 0), axis=(0, 1)))
-        & (ar >= np.roll(ar, (0, -1), axis=(0, 1)))
-        & (ar > np.roll(ar, (0, 1), axis=(0, 1)))
-        & (ar >= np.roll(ar, (-1, -1), axis=(0, 1)))
-        & (ar > np.roll(ar, (-1, 1), axis=(0, 1)))
-        & (ar >= np.roll(ar, (1, -1), axis=(0, 1)))
-        & (ar > np.roll(ar, (1, 1), axis=(0, 1)))
-    )
+    ar = ar if sigma <= 0 else _gaussian_filter_2D(ar, sigma)
+
+    # local pixelwise maxima - candidates are pixels equal to the max of
+    # their 3x3 neighborhood
+    maxima_bool = ar == maximum_filter(ar, size=3)
 
     # remove edges
     assert isinstance(edgeBoundary, (int, np.integer))
@@ -187,8 +291,22 @@ def get_maxima_2D(
     maxima_bool[:, -edgeBoundary:] = False
 
     # get indices
-    # sort by intensity
     maxima_x, maxima_y = np.nonzero(maxima_bool)
+
+    # break ties on plateaus: a candidate must be strictly greater than its
+    # neighbors at (-1,0), (0,-1), (-1,-1) and (+1,-1), so that only one pixel
+    # of a flat-topped maximum is kept
+    val = ar[maxima_x, maxima_y]
+    keep = (
+        (val > ar[maxima_x - 1, maxima_y])
+        & (val > ar[maxima_x, maxima_y - 1])
+        & (val > ar[maxima_x - 1, maxima_y - 1])
+        & (val > ar[maxima_x + 1, maxima_y - 1])
+    )
+    maxima_x, maxima_y = maxima_x[keep], maxima_y[keep]
+    maxima_x, maxima_y = _center_plateau_maxima(ar, maxima_bool, maxima_x, maxima_y)
+
+    # sort by intensity
     dtype = np.dtype([("x", float), ("y", float), ("intensity", float)])
     maxima = np.zeros(len(maxima_x), dtype=dtype)
     maxima["x"] = maxima_x
@@ -232,19 +350,18 @@ def get_maxima_2D(
     if subpixel == "poly":
         return maxima
 
-    # Fourier upsampling
+    # Fourier upsampling, for all peaks at once
     if _ar_FT is None:
         _ar_FT = np.fft.fft2(ar)
-    for ipeak in range(len(maxima["x"])):
-        xyShift = np.array((maxima["x"][ipeak], maxima["y"][ipeak]))
+    if len(maxima) > 0:
         # we actually have to lose some precision and go down to half-pixel
         # accuracy for multicorr
-        xyShift[0] = np.round(xyShift[0] * 2) / 2
-        xyShift[1] = np.round(xyShift[1] * 2) / 2
+        xyShifts = np.stack((maxima["x"], maxima["y"]), axis=1)
+        xyShifts = np.round(xyShifts * 2) / 2
 
-        subShift = upsampled_correlation(_ar_FT, upsample_factor, xyShift)
-        maxima["x"][ipeak] = subShift[0]
-        maxima["y"][ipeak] = subShift[1]
+        subShifts = upsampled_correlation_batched(_ar_FT, upsample_factor, xyShifts)
+        maxima["x"] = subShifts[:, 0]
+        maxima["y"] = subShifts[:, 1]
 
     maxima = np.sort(maxima, order="intensity")[::-1]
     return maxima
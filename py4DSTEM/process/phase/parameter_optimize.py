@@ -1,19 +1,22 @@
+import copy
+import inspect
+import os
+import time
+import warnings
+from collections import ChainMap, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from itertools import product
+from threading import Lock
 from typing import Callable, Union
 
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.gridspec import GridSpec
 from py4DSTEM.process.phase.phase_base_class import PhaseReconstruction
 from py4DSTEM.process.phase.utils import AffineTransform
-from skopt import gp_minimize
-from skopt.plots import plot_convergence as skopt_plot_convergence
-from skopt.plots import plot_evaluations as skopt_plot_evaluations
-from skopt.plots import plot_gaussian_process as skopt_plot_gaussian_process
-from skopt.plots import plot_objective as skopt_plot_objective
+from skopt import Optimizer, forest_minimize, gbrt_minimize, gp_minimize
+from skopt import dump as skopt_dump
+from skopt import load as skopt_load
 from skopt.space import Categorical, Integer, Real
-from skopt.utils import use_named_args
 from tqdm import tqdm
 
 
@@ -82,14 +85,16 @@ class PtychographyOptimizer:
             self._reconstruction_optimize_args,
         ) = self._split_static_and_optimization_vars(reconstruction_args)
 
-        # Save list of skopt parameter objects and inital guess
+        # Save list of skopt parameter objects and inital guess.
+        # ChainMap iterates its maps last to first, so the parameters are ordered
+        # init, affine, preprocess, reconstruct without merging the dicts
         self._parameter_list = []
         self._x0 = []
-        for k, v in (
-            self._init_optimize_args
-            | self._affine_optimize_args
-            | self._preprocess_optimize_args
-            | self._reconstruction_optimize_args
+        for k, v in ChainMap(
+            self._reconstruction_optimize_args,
+            self._preprocess_optimize_args,
+            self._affine_optimize_args,
+            self._init_optimize_args,
         ).items():
             self._parameter_list.append(v._get(k))
             self._x0.append(v._initial_value)
@@ -204,6 +209,9 @@ class PtychographyOptimizer:
         pbar.close()
 
         if plot_reconstructed_objects:
+            import matplotlib.pyplot as plt
+            from matplotlib.gridspec import GridSpec
+
             if len(n_points) == 2:
                 nrows, ncols = n_points
             else:
@@ -253,6 +261,15 @@ class PtychographyOptimizer:
         n_calls: int = 50,
         n_initial_points: int = 20,
         error_metric: Union[Callable, str] = "log",
+        num_threads: int = 1,
+        surrogate: str = "gp",
+        n_points: int = 10000,
+        n_restarts_optimizer: int = 5,
+        n_jobs: int = -1,
+        preprocess_cache_size: int = 1,
+        pruning_quantile: float = None,
+        resume: bool = False,
+        checkpoint_path: str = None,
         **skopt_kwargs: dict,
     ):
         """
@@ -263,8 +280,8 @@ class PtychographyOptimizer:
         n_calls: int
             Number of times to run ptychographic reconstruction
         n_initial_points: int
-            Number of uniformly spaced trial points to test before
-            beginning Bayesian optimization (must be less than n_calls)
+            Number of trial points, sampled with a Latin hypercube by default,
+            to test before beginning Bayesian optimization (must be less than n_calls)
         error_metric: Callable or str
             Function used to compute the reconstruction error.
             When passed as a string, may be one of:
@@ -283,13 +300,66 @@ class PtychographyOptimizer:
             When passed as a Callable, a function that takes the
                 PhaseReconstruction object as its only argument
                 and returns the error metric as a single float
+        num_threads: int
+            Number of reconstructions to run concurrently. If larger than 1,
+            batches of num_threads points are proposed with the constant-liar
+            strategy of skopt.Optimizer and evaluated on a thread pool
+        surrogate: str
+            Surrogate model of the error, one of:
+                'gp': Gaussian process (skopt.gp_minimize)
+                'rf': random forest (skopt.forest_minimize)
+                'et': extra trees (skopt.forest_minimize)
+                'gbrt': gradient boosted trees (skopt.gbrt_minimize)
+            Tree-based models are cheaper to fit for many calls, and
+            handle categorical parameters more naturally
+        n_points: int
+            Number of random points at which the acquisition function is
+            evaluated when searching for the next trial point
+        n_restarts_optimizer: int
+            Number of L-BFGS restarts when optimizing the acquisition
+            function (Gaussian process surrogate only). Lowering n_points and
+            n_restarts_optimizer reduces the overhead of each optimizer step,
+            which becomes noticeable for hundreds of calls
+        n_jobs: int
+            Number of cores used to optimize the acquisition function and
+            fit tree-based surrogates. -1 uses all cores
+        preprocess_cache_size: int
+            Number of preprocessed ptycho objects kept for reuse by trial points
+            sharing the same init, affine, and preprocess parameter values.
+            Each cached object holds its own preprocessed arrays in memory
+        pruning_quantile: float, optional
+            If not None, reconstructions are stopped early after a quarter or
+            half of their iterations if their error is worse than this quantile
+            of the errors of previous trials at the same iteration. The metric of
+            the partial reconstruction is returned, which biases the optimizer
+            towards quickly converging parameters
+        resume: bool
+            If True, continue from the result of the previous call to optimize,
+            seeding the model with its evaluated points and skipping the initial
+            points. n_calls then counts the additional reconstructions
+        checkpoint_path: str, optional
+            If not None, the optimization result is saved to this file with
+            skopt.dump after every evaluation. With resume=True, an existing
+            checkpoint is loaded and continued, e.g. after an interrupted run
         skopt_kwargs: dict
-            Additional arguments to be passed to skopt.gp_minimize
+            Additional arguments to be passed to the skopt minimize function,
+            or to skopt.Optimizer if num_threads is larger than 1.
+            With acq_func="EIps" or "PIps", the time of each reconstruction is
+            also returned to the optimizer, favoring cheaper trial points
 
         """
 
+        if surrogate not in ("gp", "rf", "et", "gbrt"):
+            raise ValueError(
+                f"surrogate must be one of 'gp', 'rf', 'et', or 'gbrt', not {surrogate}"
+            )
+
         error_metric = self._get_error_metric(error_metric)
 
+        # The "per second" acquisition functions expect the objective to
+        # return the compute time as a second value
+        time_aware = skopt_kwargs.get("acq_func", "gp_hedge") in ("EIps", "PIps")
+
         optimization_function = self._get_optimization_function(
             self._reconstruction_type,
             self._parameter_list,
@@ -302,26 +372,94 @@ class PtychographyOptimizer:
             self._preprocess_optimize_args,
             self._reconstruction_optimize_args,
             error_metric,
+            copy_preprocessed=num_threads > 1,
+            preprocess_cache_size=preprocess_cache_size,
+            pruning_quantile=pruning_quantile,
+            return_time=time_aware,
         )
 
-        # Make a progress bar
-        pbar = tqdm(total=n_calls, desc="Optimizing parameters")
+        previous_result = None
+        if resume:
+            if checkpoint_path is not None and os.path.exists(checkpoint_path):
+                previous_result = skopt_load(checkpoint_path)
+            else:
+                previous_result = getattr(self, "_skopt_result", None)
+
+        if previous_result is not None:
+            x0 = list(previous_result.x_iters)
+            y0 = list(previous_result.func_vals)
+            if time_aware and "log_time" in previous_result:
+                y0 = list(zip(y0, np.exp(previous_result.log_time)))
+            n_initial_points = 0
+        else:
+            x0 = [self._x0]
+            y0 = None
+
+        # Make a progress bar, counting only the evaluations of this call
+        num_previous = 0 if y0 is None else len(y0)
+        pbar = tqdm(total=n_calls, desc="Optimizing parameters", mininterval=0.5)
+
+        def checkpoint(res):
+            if checkpoint_path is not None:
+                # the specs hold the objective and callbacks, which can't be pickled
+                res = copy.copy(res)
+                res.pop("specs", None)
+                skopt_dump(res, checkpoint_path)
 
         # We need to wrap the callback because if it returns a value
         # the optimizer breaks its loop
-        def callback(*args, **kwargs):
-            pbar.update(1)
+        def callback(res):
+            pbar.update(len(res.func_vals) - num_previous - pbar.n)
+            checkpoint(res)
+
+        # Latin hypercube sampling needs initial points to sample, which a resumed
+        # optimization skips
+        if n_initial_points > 0:
+            skopt_kwargs.setdefault("initial_point_generator", "lhs")
 
         try:
-            self._skopt_result = gp_minimize(
-                optimization_function,
-                self._parameter_list,
-                n_calls=n_calls,
-                n_initial_points=n_initial_points,
-                x0=self._x0,
-                callback=callback,
-                **skopt_kwargs,
-            )
+            if num_threads > 1:
+                self._skopt_result = self._batched_minimize(
+                    optimization_function,
+                    x0=x0,
+                    y0=y0,
+                    n_calls=n_calls,
+                    n_initial_points=n_initial_points,
+                    num_threads=num_threads,
+                    base_estimator=surrogate.upper(),
+                    callback=callback,
+                    n_jobs=n_jobs,
+                    acq_optimizer_kwargs={
+                        "n_points": n_points,
+                        "n_restarts_optimizer": n_restarts_optimizer,
+                        "n_jobs": n_jobs,
+                    },
+                    **skopt_kwargs,
+                )
+            else:
+                if surrogate == "gp":
+                    minimize = partial(
+                        gp_minimize, n_restarts_optimizer=n_restarts_optimizer
+                    )
+                elif surrogate == "gbrt":
+                    minimize = gbrt_minimize
+                else:
+                    minimize = partial(
+                        forest_minimize, base_estimator=surrogate.upper()
+                    )
+
+                self._skopt_result = minimize(
+                    optimization_function,
+                    self._parameter_list,
+                    n_calls=n_calls,
+                    n_initial_points=n_initial_points,
+                    x0=x0,
+                    y0=y0,
+                    callback=callback,
+                    n_points=n_points,
+                    n_jobs=n_jobs,
+                    **skopt_kwargs,
+                )
 
             # Remove the optimization result's reference to the function, as it potentially contains a
             # copy of the ptycho object
@@ -346,6 +484,61 @@ class PtychographyOptimizer:
 
         return self
 
+    def _batched_minimize(
+        self,
+        optimization_function: Callable,
+        x0: list,
+        y0: list,
+        n_calls: int,
+        n_initial_points: int,
+        num_threads: int,
+        base_estimator: str,
+        callback: Callable = None,
+        **skopt_kwargs: dict,
+    ):
+        """
+        Ask/tell counterpart of the skopt minimize functions, which
+        evaluates batches of num_threads points concurrently. Batches are
+        proposed with the constant-liar strategy, so points within a batch
+        are spread out.
+        Threads are used rather than processes, so the datacube is shared
+        and the optimization function does not need to be picklable.
+        If given, callback is called with the result after every batch.
+        """
+        optimizer = Optimizer(
+            self._parameter_list,
+            base_estimator=base_estimator,
+            n_initial_points=n_initial_points,
+            **skopt_kwargs,
+        )
+
+        # as in gp_minimize, x0 is evaluated first, unless y0 is given
+        if y0 is None:
+            x_batch = x0
+        else:
+            optimizer.tell(x0, y0)
+            x_batch = optimizer.ask(
+                n_points=min(num_threads, n_calls), strategy="cl_min"
+            )
+
+        num_remaining = n_calls
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            while True:
+                y_batch = list(executor.map(optimization_function, x_batch))
+                result = optimizer.tell(x_batch, y_batch)
+                if callback is not None:
+                    callback(result)
+
+                num_remaining -= len(x_batch)
+                if num_remaining <= 0:
+                    break
+
+                x_batch = optimizer.ask(
+                    n_points=min(num_threads, num_remaining), strategy="cl_min"
+                )
+
+        return result
+
     def visualize(
         self,
         plot_gp_model=True,
@@ -370,6 +563,14 @@ class PtychographyOptimizer:
         kwargs:
             Passed directly to the skopt plot_gassian_process/plot_objective
         """
+        # plotting dependencies are only imported when visualizing
+        import matplotlib.pyplot as plt
+        from matplotlib.gridspec import GridSpec
+        from skopt.plots import plot_convergence as skopt_plot_convergence
+        from skopt.plots import plot_evaluations as skopt_plot_evaluations
+        from skopt.plots import plot_gaussian_process as skopt_plot_gaussian_process
+        from skopt.plots import plot_objective as skopt_plot_objective
+
         ndims = len(self._parameter_list)
         if ndims == 1:
             if plot_convergence:
@@ -459,16 +660,22 @@ class PtychographyOptimizer:
 
     def _get_scan_positions(self, affine_transform, dataset):
         scan_positions = self._init_static_args.get("initial_scan_positions", None)
-        if scan_positions is None:
-            R_pixel_size = dataset.calibration.get_R_pixel_size()
-            x, y = (
-                np.arange(dataset.R_Nx) * R_pixel_size,
-                np.arange(dataset.R_Ny) * R_pixel_size,
-            )
-            x, y = np.meshgrid(x, y, indexing="ij")
-            scan_positions = np.stack((x.ravel(), y.ravel()), axis=1)
-        scan_positions = scan_positions @ affine_transform.asarray()
-        return scan_positions
+        if scan_positions is not None:
+            # user-supplied positions may be a strided view, e.g. a transpose
+            return np.ascontiguousarray(scan_positions) @ affine_transform.asarray()
+
+        # For a raster grid, (x, y) @ A = x * A[0] + y * A[1], so each transformed
+        # coordinate is an outer sum, written directly into the output
+        A = affine_transform.asarray()
+        R_pixel_size = dataset.calibration.get_R_pixel_size()
+        x, y = (
+            np.arange(dataset.R_Nx) * R_pixel_size,
+            np.arange(dataset.R_Ny) * R_pixel_size,
+        )
+        scan_positions = np.empty((dataset.R_Nx, dataset.R_Ny, 2))
+        np.add.outer(x * A[0, 0], y * A[1, 0], out=scan_positions[..., 0])
+        np.add.outer(x * A[0, 1], y * A[1, 1], out=scan_positions[..., 1])
+        return scan_positions.reshape(-1, 2)
 
     def _get_error_metric(self, error_metric: Union[Callable, str]) -> Callable:
         """
@@ -590,17 +797,42 @@ class PtychographyOptimizer:
         preprocess_optimization_params: dict,
         reconstruct_optimization_params: dict,
         error_metric: Callable,
+        copy_preprocessed: bool = False,
+        preprocess_cache_size: int = 1,
+        pruning_quantile: float = None,
+        pruning_warmup: int = 5,
+        return_time: bool = False,
     ):
         """
         Wrap the ptychography pipeline into a single function that encapsulates all of the
-        non-optimization arguments and accepts a concatenated set of keyword arguments. The
+        non-optimization arguments and accepts a concatenated vector of parameters. The
         wrapper function returns the final error value from the ptychography run.
 
-        parameter_list is a list of skopt Dimension objects
+        parameter_list is a list of skopt Dimension objects, ordered as the init, affine,
+        preprocess, and reconstruct optimization parameters
 
         Both static and optimization args are passed in dictionaries. The values of the
         static dictionary are the fixed parameters, and only the keys of the optimization
         dictionary are used.
+
+        Up to preprocess_cache_size preprocessed ptycho objects are kept for reuse by
+        calls with the same init, affine, and preprocess parameter values. If
+        copy_preprocessed is True, each call reconstructs a copy of the preprocessed
+        ptycho object, so that calls may run concurrently. Copies share the datacube,
+        but each holds its own preprocessed arrays (e.g. the diffraction amplitudes).
+
+        If pruning_quantile is not None, reconstructions are run in segments, and are
+        stopped after a segment if their error exceeds that quantile of the errors of
+        at least pruning_warmup previous calls after the same number of iterations.
+        Segments use successive seeds from seed_random, so their batch orders differ
+        from those of an unsegmented run, and each segment repeats the setup and
+        finalization work of reconstruct (e.g. copying the object and probe to host
+        memory).
+
+        Results are memoized on the parameter values, with floats rounded to six
+        significant digits, so repeated trial points are not reconstructed again.
+        If return_time is True, the elapsed time of the original evaluation is also
+        returned, as expected by the EIps and PIps acquisition functions.
         """
 
         # Get lists of optimization parameters for each step
@@ -609,53 +841,176 @@ class PtychographyOptimizer:
         prep_params = list(preprocess_optimization_params.keys())
         reco_params = list(reconstruct_optimization_params.keys())
 
-        # Construct partial methods to encapsulate the static parameters.
-        # If only ``reconstruct`` has optimization variables, perform
-        # preprocessing now, store the ptycho object, and use dummy
-        # functions instead of the partials
-        if (len(init_params), len(afft_params), len(prep_params)) == (0, 0, 0):
-            affine_preprocessed = AffineTransform(**affine_static_args)
-            init_args = init_static_args.copy()
-            init_args["initial_scan_positions"] = self._get_scan_positions(
-                affine_preprocessed, init_static_args["datacube"]
+        # Check all arguments against the signatures once, so that unknown arguments
+        # raise a TypeError here rather than in the first evaluation. The partials
+        # below then forward them without further inspection
+        inspect.signature(cls).bind_partial(
+            **init_static_args, **dict.fromkeys(init_params)
+        )
+        inspect.signature(cls.preprocess).bind_partial(
+            None, **preprocess_static_args, **dict.fromkeys(prep_params)
+        )
+        inspect.signature(cls.reconstruct).bind_partial(
+            None, **reconstruct_static_args, **dict.fromkeys(reco_params)
+        )
+
+        # Construct partial methods to encapsulate the static parameters
+        obj = partial(cls, **init_static_args)
+        prep = partial(cls.preprocess, **preprocess_static_args)
+        affine = partial(AffineTransform, **affine_static_args)
+        recon = partial(cls.reconstruct, **reconstruct_static_args)
+
+        if pruning_quantile is not None:
+            reconstruct = recon
+            default_num_iter = (
+                inspect.signature(cls.reconstruct).parameters["num_iter"].default
             )
+            static_num_iter = reconstruct_static_args.get("num_iter", default_num_iter)
+            errors_at_iteration = {}
+            errors_lock = Lock()
+
+            static_seed_random = reconstruct_static_args.get("seed_random", None)
+
+            def recon(ptycho, **reco_args):
+                num_iter = reco_args.pop("num_iter", static_num_iter)
+                seed_random = reco_args.pop("seed_random", static_seed_random)
+
+                # Continue each segment from the previous one, and compare the
+                # error after a quarter and half of the iterations. Each call to
+                # reconstruct re-seeds and restarts the batch shuffle, so a given
+                # seed is advanced per segment rather than repeating the shuffles
+                # of the first segment
+                continue_args = {}
+                iteration = 0
+                checkpoints = sorted({num_iter // 4, num_iter // 2} - {0})
+                for segment, checkpoint in enumerate(checkpoints):
+                    reconstruct(
+                        ptycho,
+                        num_iter=checkpoint - iteration,
+                        seed_random=(
+                            None if seed_random is None else seed_random + segment
+                        ),
+                        **continue_args,
+                        **reco_args,
+                    )
+                    continue_args = {"reset": False}
+                    iteration = checkpoint
+
+                    with errors_lock:
+                        previous_errors = errors_at_iteration.setdefault(iteration, [])
+                        threshold = (
+                            np.quantile(previous_errors, pruning_quantile)
+                            if len(previous_errors) >= pruning_warmup
+                            else np.inf
+                        )
+                        previous_errors.append(ptycho.error)
+                    if ptycho.error > threshold:
+                        return ptycho
+
+                return reconstruct(
+                    ptycho,
+                    num_iter=num_iter - iteration,
+                    seed_random=(
+                        None if seed_random is None else seed_random + len(checkpoints)
+                    ),
+                    **continue_args,
+                    **reco_args,
+                )
 
-            ptycho_preprocessed = cls(**init_args).preprocess(**preprocess_static_args)
+        # Preprocessed ptycho objects are cached, keyed on the values of the init,
+        # affine, and preprocess optimization parameters, so that calls differing
+        # only in reconstruct parameters skip preprocessing. Since reconstruct
+        # is called with reset=True, a cached object can be reconstructed again.
+        # If only reconstruct has optimization variables, the single key is ()
+        dataset = init_static_args["datacube"]
+        if init_params or afft_params or prep_params:
+            max_cache_size = preprocess_cache_size
+        else:
+            max_cache_size = 1
+        preprocessed_cache = OrderedDict()
+        cache_lock = Lock()
 
-            def obj(**kwargs):
-                return ptycho_preprocessed
+        # Apply the affine transform to the pixel grid, using the calibrations
+        # lifted from the dataset. Without affine optimization variables the
+        # positions are fixed, and are only computed once
+        if afft_params:
 
-            def prep(ptycho, **kwargs):
-                return ptycho
+            def get_scan_positions(afft_args):
+                return self._get_scan_positions(affine(**afft_args), dataset)
 
         else:
-            obj = partial(cls, **init_static_args)
-            prep = partial(cls.preprocess, **preprocess_static_args)
+            static_scan_positions = self._get_scan_positions(affine(), dataset)
 
-        affine = partial(AffineTransform, **affine_static_args)
-        recon = partial(cls.reconstruct, **reconstruct_static_args)
+            def get_scan_positions(afft_args):
+                # preprocess may shift the positions in-place
+                return static_scan_positions.copy()
+
+        def get_preprocessed(init_args, afft_args, prep_args):
+            key = (
+                tuple(init_args.values())
+                + tuple(afft_args.values())
+                + tuple(prep_args.values())
+            )
+            with cache_lock:
+                ptycho = preprocessed_cache.get(key)
+                if ptycho is not None:
+                    preprocessed_cache.move_to_end(key)
+
+            if ptycho is None:
+                init_args["initial_scan_positions"] = get_scan_positions(afft_args)
+
+                ptycho = obj(**init_args)
+                prep(ptycho, **prep_args)
+
+                if max_cache_size < 1:
+                    return ptycho
+
+                with cache_lock:
+                    preprocessed_cache[key] = ptycho
+                    while len(preprocessed_cache) > max_cache_size:
+                        preprocessed_cache.popitem(last=False)
+
+            # Concurrent calls reconstruct copies, leaving the cached object
+            # untouched. The memo shares the datacube, while the preprocessed
+            # arrays, which reconstruct may modify in place, are copied per call
+            if copy_preprocessed:
+                return copy.deepcopy(ptycho, memo={id(dataset): dataset})
+            return ptycho
+
+        # Offsets of each step's parameters in the concatenated parameter vector,
+        # which follows the order of parameter_list
+        i_afft = len(init_params)
+        i_prep = i_afft + len(afft_params)
+        i_reco = i_prep + len(prep_params)
+
+        evaluations = {}
+        evaluations_lock = Lock()
 
         # Target function for Gaussian process optimization that takes a single
-        # dict of named parameters and returns the ptycho error metric
-        @use_named_args(parameter_list)
-        def f(**kwargs):
-            init_args = {k: kwargs[k] for k in init_params}
-            afft_args = {k: kwargs[k] for k in afft_params}
-            prep_args = {k: kwargs[k] for k in prep_params}
-            reco_args = {k: kwargs[k] for k in reco_params}
-
-            # Create affine transform object
-            tr = affine(**afft_args)
-            # Apply affine transform to pixel grid, using the
-            # calibrations lifted from the dataset
-            dataset = init_static_args["datacube"]
-            init_args["initial_scan_positions"] = self._get_scan_positions(tr, dataset)
-
-            ptycho = obj(**init_args)
-            prep(ptycho, **prep_args)
+        # vector of parameters and returns the ptycho error metric
+        def f(x):
+            key = tuple(float(f"{v:.6g}") if isinstance(v, float) else v for v in x)
+            with evaluations_lock:
+                if key in evaluations:
+                    return evaluations[key]
+
+            start_time = time.perf_counter()
+
+            init_args = dict(zip(init_params, x[:i_afft]))
+            afft_args = dict(zip(afft_params, x[i_afft:i_prep]))
+            prep_args = dict(zip(prep_params, x[i_prep:i_reco]))
+            reco_args = dict(zip(reco_params, x[i_reco:]))
+
+            ptycho = get_preprocessed(init_args, afft_args, prep_args)
             recon(ptycho, **reco_args)
 
-            return error_metric(ptycho)
+            result = error_metric(ptycho)
+            if return_time:
+                result = (result, time.perf_counter() - start_time)
+
+            with evaluations_lock:
+                evaluations[key] = result
+            return result
 
         return f
 
@@ -695,7 +1050,7 @@ class OptimizationParameter:
         initial_value: Union[float, int, bool],
         lower_bound: Union[float, int, bool] = None,
         upper_bound: Union[float, int, bool] = None,
-        scaling: str = "uniform",
+        scaling: str = None,
         space: str = "real",
         categories: list = [],
     ):
@@ -709,7 +1064,9 @@ class OptimizationParameter:
         lower_bound, upper_bound:
             Bounds on real or integer variables (not needed for bool or categorical)
         scaling: str
-            Prior knowledge on sensitivity of the variable. Can be 'uniform' or 'log-uniform'
+            Prior knowledge on sensitivity of the variable. Can be 'uniform' or
+            'log-uniform'. If None, real variables with positive bounds spanning more
+            than two orders of magnitude use 'log-uniform', and all others use 'uniform'
         space: str
             Type of variable. Can be 'real', 'integer', 'bool', or 'categorical'
         categories: list
@@ -720,6 +1077,26 @@ class OptimizationParameter:
         if space not in ("real", "integer", "bool", "categorical"):
             raise ValueError(f"Unknown Parameter type: {space}")
 
+        if scaling is None:
+            if (
+                space == "real"
+                and lower_bound is not None
+                and upper_bound is not None
+                and lower_bound > 0
+                and upper_bound / lower_bound > 100
+            ):
+                scaling = "log-uniform"
+                warnings.warn(
+                    (
+                        f"Bounds ({lower_bound}, {upper_bound}) span more than two "
+                        "orders of magnitude, using scaling='log-uniform'. "
+                        "Pass scaling='uniform' to override."
+                    ),
+                    UserWarning,
+                )
+            else:
+                scaling = "uniform"
+
         scaling = scaling.lower()
         if scaling not in ("uniform", "log-uniform"):
             raise ValueError(f"Unknown scaling: {scaling}")
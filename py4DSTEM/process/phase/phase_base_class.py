@@ -2,7 +2,9 @@
 Module for reconstructing phase objects from 4DSTEM datasets using iterative methods.
 """
 
+import copy
 import sys
+import types
 import warnings
 
 import matplotlib.pyplot as plt
@@ -43,6 +45,20 @@ class PhaseReconstruction(Custom):
     Defines various common functions and properties for subclasses to inherit.
     """
 
+    def __deepcopy__(self, memo):
+        """
+        Deep copies the reconstruction. Module attributes, such as the array
+        and scipy modules set by set_device, are shared rather than copied.
+        """
+        result = self.__class__.__new__(self.__class__)
+        memo[id(self)] = result
+        for key, value in self.__dict__.items():
+            if isinstance(value, types.ModuleType):
+                result.__dict__[key] = value
+            else:
+                result.__dict__[key] = copy.deepcopy(value, memo)
+        return result
+
     def set_device(self, device, clear_fft_cache):
         """
         Sets calculation device.
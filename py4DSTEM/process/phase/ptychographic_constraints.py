@@ -1064,7 +1064,7 @@ class ProbeConstraintsMixin:
 
         fourier_probe = xp.fft.fft2(current_probe)
         if remove_initial_probe_aberrations:
-            fourier_probe *= xp.conj(self._known_aberrations_array)
+            fourier_probe *= self._return_known_aberrations_conj()
 
         fourier_probe_abs = xp.abs(fourier_probe)
         sampling = self.sampling
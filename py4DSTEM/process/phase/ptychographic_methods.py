@@ -3,6 +3,7 @@ from typing import Sequence, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
+import scipy.fft as sp_fft
 from emdfile import tqdmnd
 from matplotlib.gridspec import GridSpec
 from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -24,7 +25,7 @@ from py4DSTEM.process.utils import (
     get_shifted_ar,
 )
 from py4DSTEM.visualize import return_scaled_histogram_ordering, show, show_complex
-from scipy.ndimage import gaussian_filter, rotate
+from scipy.ndimage import affine_transform, gaussian_filter, map_coordinates
 
 try:
     import cupy as cp
@@ -83,6 +84,7 @@ class ObjectNDMethodsMixin:
         array,
         positions_px=None,
         padding=0,
+        on_device=False,
     ):
         """
         Crops and rotated object to FOV bounded by current pixel positions.
@@ -90,9 +92,11 @@ class ObjectNDMethodsMixin:
         Parameters
         ----------
         array: np.ndarray
-            Object array to crop and rotate. Only operates on numpy arrays for compatibility.
+            Object array to crop and rotate. Returned as a numpy array unless on_device.
         padding: int, optional
             Optional padding outside pixel positions
+        on_device: bool, optional
+            If True, array is rotated on the calculation device and returned there
 
         Returns
         cropped_rotated_array: np.ndarray
@@ -101,6 +105,15 @@ class ObjectNDMethodsMixin:
 
         asnumpy = self._asnumpy
 
+        if on_device:
+            xp = self._xp
+            array = xp.asarray(array)
+            affine_transform_array = self._scipy.ndimage.affine_transform
+        else:
+            xp = np
+            array = asnumpy(array)
+            affine_transform_array = affine_transform
+
         angle = (
             self._rotation_best_rad
             if self._rotation_best_transpose
@@ -108,10 +121,66 @@ class ObjectNDMethodsMixin:
         )
 
         if positions_px is None:
-            positions_px = asnumpy(self._positions_px)
+            # positions are corrected in place, so bounds are memoized per iteration
+            fov_key = (
+                len(getattr(self, "error_iterations", ())),
+                angle,
+                padding,
+            )
+            cache = getattr(self, "_fov_crop_cache", None)
+            if (
+                cache is not None
+                and cache[0] is self._positions_px
+                and cache[1] == fov_key
+            ):
+                min_x, min_y, max_x, max_y = cache[2]
+            else:
+                min_x, min_y, max_x, max_y = self._return_fov_crop_bounds(
+                    asnumpy(self._positions_px), angle, padding
+                )
+                self._fov_crop_cache = (
+                    self._positions_px,
+                    fov_key,
+                    (min_x, min_y, max_x, max_y),
+                )
+        else:
+            min_x, min_y, max_x, max_y = self._return_fov_crop_bounds(
+                asnumpy(positions_px), angle, padding
+            )
+
+        max_x = max(min(max_x, array.shape[-2]), min_x)
+        max_y = max(min(max_y, array.shape[-1]), min_y)
+
+        if abs(angle) < 1e-10:
+            # no rotation, so the FOV is a plain crop
+            rotated_array = array[..., min_x:max_x, min_y:max_y].copy()
         else:
-            positions_px = asnumpy(positions_px)
+            # equivalent to rotate(array, -angle, reshape=False, order=1) followed by
+            # cropping, but interpolating only the cropped output pixels
+            cos_a, sin_a = np.cos(angle), np.sin(angle)
+            rot_matrix = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
+            center = (np.array(array.shape[-2:]) - 1) / 2
+
+            matrix = np.eye(array.ndim)
+            matrix[-2:, -2:] = rot_matrix
+            offset = np.zeros(array.ndim)
+            offset[-2:] = center - rot_matrix @ center + rot_matrix @ (min_x, min_y)
+
+            rotated_array = affine_transform_array(
+                array,
+                xp.asarray(matrix),
+                offset=tuple(offset),
+                output_shape=array.shape[:-2] + (max_x - min_x, max_y - min_y),
+                order=1,
+            )
+
+        if self._rotation_best_transpose:
+            rotated_array = rotated_array.swapaxes(-2, -1)
 
+        return rotated_array
+
+    def _return_fov_crop_bounds(self, positions_px, angle, padding):
+        """Returns (min_x, min_y, max_x, max_y) of positions_px rotated by angle"""
         tf = AffineTransform(angle=angle)
         rotated_points = tf(positions_px, origin=positions_px.mean(0), xp=np)
 
@@ -120,14 +189,98 @@ class ObjectNDMethodsMixin:
         min_y = min_y if min_y > 0 else 0
         max_x, max_y = np.ceil(np.amax(rotated_points, axis=0) + padding).astype("int")
 
-        rotated_array = rotate(
-            asnumpy(array), np.rad2deg(-angle), order=1, reshape=False, axes=(-2, -1)
-        )[..., min_x:max_x, min_y:max_y]
+        return min_x, min_y, max_x, max_y
 
-        if self._rotation_best_transpose:
-            rotated_array = rotated_array.swapaxes(-2, -1)
+    def _return_object_phase(self, obj):
+        """
+        Returns the phase of complex obj, written into a reusable scratch buffer.
+        The buffer is overwritten on the next call, so the result is only for
+        transient use.
+        """
+        xp = self._xp
 
-        return rotated_array
+        scratch = getattr(self, "_object_phase_scratch", None)
+        if (
+            scratch is None
+            or type(scratch) is not type(obj)
+            or scratch.shape != obj.shape
+            or scratch.dtype != obj.real.dtype
+        ):
+            scratch = xp.empty(obj.shape, dtype=obj.real.dtype)
+            self._object_phase_scratch = scratch
+
+        return xp.arctan2(obj.imag, obj.real, out=scratch)
+
+    def _fft2_object(self, array, overwrite_x=False):
+        """
+        2D FFT over the last two axes of array, which is on the calculation device.
+        Uses multithreaded scipy.fft on the CPU. If overwrite_x is True, array
+        is a temporary whose buffer may be reused for the output.
+        """
+        xp = self._xp
+
+        if xp is np:
+            return sp_fft.fft2(
+                array, axes=(-2, -1), overwrite_x=overwrite_x, workers=-1
+            )
+
+        if overwrite_x:
+            import cupyx.scipy.fft as cp_fft
+
+            return cp_fft.fft2(array, axes=(-2, -1), overwrite_x=True)
+
+        return xp.fft.fft2(array, axes=(-2, -1))
+
+    def _return_fft_amplitude(self, array_fft):
+        """
+        Returns the center-shifted float32 amplitude of array_fft as a numpy array.
+        The amplitude is taken before shifting, so only real values are moved.
+        """
+        xp = self._xp
+        asnumpy = self._asnumpy
+
+        amplitude = xp.abs(array_fft).astype(xp.float32, copy=False)
+
+        return asnumpy(xp.fft.fftshift(amplitude, axes=(-2, -1)))
+
+    def _object_fft_cache_key(self, obj, *args):
+        """
+        Returns the key under which the FFT of obj is memoized, or None if obj
+        is not the current object estimate. The object is updated in place, so
+        the number of completed iterations stands in for its contents. Edits to
+        the object outside of reconstruct are therefore not detected, and the
+        stale FFT is returned until the next iteration.
+        """
+        if obj is not getattr(self, "_object", None):
+            return None
+
+        return (
+            obj.shape,
+            obj.dtype,
+            len(getattr(self, "error_iterations", ())),
+            self._rotation_best_rad,
+            self._rotation_best_transpose,
+        ) + args
+
+    def _return_cached_object_fft(self, obj, cache_key):
+        """Returns the memoized FFT of obj, or None if cache_key misses"""
+        cache = getattr(self, "_object_fft_cache", None)
+        if cache_key is None or cache is None:
+            return None
+
+        cached_obj, cached_key, object_fft = cache
+        if cached_obj is obj and cached_key == cache_key:
+            return object_fft
+
+        return None
+
+    def _store_object_fft(self, obj, cache_key, object_fft):
+        """Memoizes object_fft (read-only) for obj under cache_key"""
+        if cache_key is not None:
+            object_fft.flags.writeable = False
+            self._object_fft_cache = (obj, cache_key, object_fft)
+
+        return object_fft
 
     def _return_projected_cropped_potential(
         self,
@@ -171,23 +324,34 @@ class ObjectNDMethodsMixin:
             Amplitude of Fourier-transformed and center-shifted obj.
         """
         xp = self._xp
-        asnumpy = self._asnumpy
 
         if obj is None:
             obj = self._object
 
+        cache_key = self._object_fft_cache_key(obj, apply_hanning_window)
+        object_fft = self._return_cached_object_fft(obj, cache_key)
+        if object_fft is not None:
+            return object_fft
+        cached_obj = obj
+
+        obj = xp.asarray(obj)
         if np.iscomplexobj(obj):
-            obj = xp.angle(obj)
+            obj = self._return_object_phase(obj)
+
+        # single precision is ample for display, and keeps the FFT complex64
+        obj = obj.astype(xp.float32, copy=False)
 
-        obj = self._crop_rotate_object_fov(asnumpy(obj))
+        obj = self._crop_rotate_object_fov(obj, on_device=True)
 
         if apply_hanning_window:
             sx, sy = obj.shape
-            wx = np.hanning(sx)
-            wy = np.hanning(sy)
+            wx = xp.hanning(sx)
+            wy = xp.hanning(sy)
             obj *= wx[:, None] * wy[None, :]
 
-        return np.abs(np.fft.fftshift(np.fft.fft2(obj)))
+        object_fft = self._return_fft_amplitude(self._fft2_object(obj))
+
+        return self._store_object_fft(cached_obj, cache_key, object_fft)
 
     def show_object_fft(
         self,
@@ -261,6 +425,8 @@ class ObjectNDMethodsMixin:
 
         # reset can be True, False, or None (default)
         if reset is True:
+            self._object_fft_cache = None
+            self._fov_crop_cache = None
             self.error_iterations = []
             self._object = self._object_initial.copy()
             self._probe = self._probe_initial.copy()
@@ -300,7 +466,8 @@ class ObjectNDMethodsMixin:
         if not hasattr(self, "_object"):
             return None
 
-        return self._return_object_fft(self._object)
+        # the memoized array is read-only and shared, so return a copy
+        return self._return_object_fft(self._object).copy()
 
     @property
     def object_cropped(self):
@@ -315,6 +482,10 @@ class Object2p5DMethodsMixin:
     Overwrites ObjectNDMethodsMixin.
     """
 
+    # if True, complex objects are projected before taking the phase,
+    # i.e. angle(sum(obj)) instead of sum(angle(obj))
+    _project_then_angle = False
+
     def _precompute_propagator_arrays(
         self,
         gpts: Tuple[int, int],
@@ -451,14 +622,16 @@ class Object2p5DMethodsMixin:
         """Utility function to accommodate multiple classes"""
 
         if obj is None:
-            obj = self.object_cropped
-        else:
-            obj = self._crop_rotate_object_fov(obj)
+            obj = self._object
 
-        if np.iscomplexobj(obj):
-            obj = np.angle(obj).sum(0)
+        if np.iscomplexobj(obj) and not self._project_then_angle:
+            obj = np.angle(self._crop_rotate_object_fov(obj)).sum(0, dtype=np.float32)
         else:
-            obj = obj.sum(0)
+            # cropping and rotating are linear, so only the 2D projection is rotated
+            sum_dtype = np.complex64 if np.iscomplexobj(obj) else np.float32
+            obj = self._crop_rotate_object_fov(obj.sum(0, dtype=sum_dtype))
+            if np.iscomplexobj(obj):
+                obj = np.angle(obj)
 
         if return_kwargs:
             return obj, kwargs
@@ -491,18 +664,32 @@ class Object2p5DMethodsMixin:
         if obj is None:
             obj = self._object
 
+        cache_key = self._object_fft_cache_key(obj, apply_hanning_window)
+        object_fft = self._return_cached_object_fft(obj, cache_key)
+        if object_fft is not None:
+            return object_fft
+        cached_obj = obj
+
+        obj = xp.asarray(obj)
         if np.iscomplexobj(obj):
-            obj = xp.angle(obj)
+            obj = self._return_object_phase(obj)
+
+        # single precision is ample for display, and keeps the FFT complex64
+        obj = obj.astype(xp.float32, copy=False)
 
-        obj = self._crop_rotate_object_fov(obj.sum(axis=0))
+        obj = self._crop_rotate_object_fov(
+            obj.sum(axis=0, dtype=xp.float32), on_device=True
+        )
 
         if apply_hanning_window:
             sx, sy = obj.shape
-            wx = np.hanning(sx)
-            wy = np.hanning(sy)
+            wx = xp.hanning(sx)
+            wy = xp.hanning(sy)
             obj *= wx[:, None] * wy[None, :]
 
-        return np.abs(np.fft.fftshift(np.fft.fft2(obj)))
+        object_fft = self._return_fft_amplitude(self._fft2_object(obj))
+
+        return self._store_object_fft(cached_obj, cache_key, object_fft)
 
     def show_depth_section(
         self,
@@ -566,31 +753,49 @@ class Object2p5DMethodsMixin:
             y1 /= self.sampling[1]
             y2 /= self.sampling[1]
 
-        x1, x2 = np.array([x1, x2]).clip(0, ms_object.shape[1])
-        y1, y2 = np.array([y1, y2]).clip(0, ms_object.shape[2])
+        num_slices, sx, sy = ms_object.shape
+        x1, x2 = min(max(x1, 0), sx), min(max(x2, 0), sx)
+        y1, y2 = min(max(y1, 0), sy), min(max(y2, 0), sy)
 
         angle = np.arctan2(x2 - x1, y2 - y1)
 
-        x0 = ms_object.shape[1] / 2
-        y0 = ms_object.shape[2] / 2
+        x0 = sx / 2
+        y0 = sy / 2
 
         x1_0, y1_0 = rotate_point((x0, y0), (x1, y1), angle)
         x2_0, y2_0 = rotate_point((x0, y0), (x2, y2), angle)
 
-        rotated_object = np.roll(
-            rotate(ms_object, np.rad2deg(angle), reshape=False, axes=(-1, -2)),
-            -int(x1_0),
-            axis=1,
-        )
+        y1_0, y2_0 = min(max(int(y1_0), 0), sy), min(max(int(y2_0), 0), sy)
+
+        # rotation about the array center, as in ndimage.rotate with reshape=False
+        center = (np.array([sx, sy]) - 1) / 2
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+        rot_matrix = np.array([[cos_a, sin_a], [-sin_a, cos_a]])
+        row = int(x1_0) % sx
 
         if gaussian_filter_sigma is not None:
+            # smoothing is defined on the rotated volume, so rotate it in full,
+            # with the plotted row shifted to the top in the same transform
+            matrix = np.eye(3)
+            matrix[1:, 1:] = rot_matrix
+            offset = np.zeros(3)
+            offset[1:] = center - rot_matrix @ center + rot_matrix @ (row, 0)
+            rotated_object = affine_transform(ms_object, matrix, offset=offset)
+
             gaussian_filter_sigma /= self.sampling[0]
             rotated_object = gaussian_filter(rotated_object, gaussian_filter_sigma)
 
-        y1_0, y2_0 = (
-            np.array([y1_0, y2_0]).astype("int").clip(0, rotated_object.shape[2])
-        )
-        plot_im = rotated_object[:, 0, y1_0:y2_0]
+            plot_im = rotated_object[:, 0, y1_0:y2_0]
+        else:
+            # only interpolate the rotated row which is plotted
+            cols = np.arange(y1_0, y2_0)
+            points = np.stack([np.full(cols.shape, row), cols]) - center[:, None]
+            coords_x, coords_y = rot_matrix @ points + center[:, None]
+            coords = np.broadcast_arrays(
+                np.arange(num_slices)[:, None], coords_x[None], coords_y[None]
+            )
+
+            plot_im = map_coordinates(ms_object, coords)
 
         # Plotting
         if plot_line_profile:
@@ -616,7 +821,9 @@ class Object2p5DMethodsMixin:
                 0,
             ]
 
-            ax.imshow(ms_object.sum(0), cmap="gray", extent=extent_line)
+            ax.imshow(
+                ms_object.sum(0, dtype=np.float32), cmap="gray", extent=extent_line
+            )
 
             ax.plot(
                 [y1 * self.sampling[0], y2 * self.sampling[1]],
@@ -692,14 +899,15 @@ class Object2p5DMethodsMixin:
         if ms_object is None:
             ms_object = self._object
 
-        rotated_object = self._crop_rotate_object_fov(ms_object, padding=padding)
-
         if show_fft:
-            rotated_object = np.abs(
-                np.fft.fftshift(
-                    np.fft.fft2(rotated_object, axes=(-2, -1)), axes=(-2, -1)
-                )
+            rotated_object = self._crop_rotate_object_fov(
+                ms_object, padding=padding, on_device=True
+            )
+            rotated_object = self._return_fft_amplitude(
+                self._fft2_object(rotated_object)
             )
+        else:
+            rotated_object = self._crop_rotate_object_fov(ms_object, padding=padding)
 
         rotated_shape = rotated_object.shape
 
@@ -740,7 +948,7 @@ class Object2p5DMethodsMixin:
         fig = plt.figure(figsize=figsize)
 
         for flat_index, obj_slice in enumerate(rotated_object):
-            row_index, col_index = np.unravel_index(flat_index, (num_rows, num_cols))
+            row_index, col_index = divmod(flat_index, num_cols)
             ax = fig.add_subplot(spec[row_index, col_index])
             im = ax.imshow(
                 obj_slice,
@@ -976,8 +1184,25 @@ class Object3DMethodsMixin:
 
         if obj is None:
             obj = self._object
+
+        if orientation_matrix is None:
+            orientation_key = None
         else:
-            obj = xp.asarray(obj, dtype=xp.float32)
+            orientation_key = asnumpy(orientation_matrix).tobytes()
+
+        cache_key = self._object_fft_cache_key(
+            obj,
+            apply_hanning_window,
+            orientation_key,
+            tuple(vertical_lims),
+            tuple(horizontal_lims),
+        )
+        object_fft = self._return_cached_object_fft(obj, cache_key)
+        if object_fft is not None:
+            return object_fft
+        cached_obj = obj
+
+        obj = xp.asarray(obj, dtype=xp.float32)
 
         if orientation_matrix is not None:
             obj = self._rotate_zxy_volume(
@@ -987,15 +1212,17 @@ class Object3DMethodsMixin:
 
         start_v, end_v = vertical_lims
         start_h, end_h = horizontal_lims
-        obj = asnumpy(obj.sum(0)[start_v:end_v, start_h:end_h])
+        obj = obj.sum(0)[start_v:end_v, start_h:end_h]
 
         if apply_hanning_window:
             sx, sy = obj.shape
-            wx = np.hanning(sx)
-            wy = np.hanning(sy)
+            wx = xp.hanning(sx)
+            wy = xp.hanning(sy)
             obj *= wx[:, None] * wy[None, :]
 
-        return np.abs(np.fft.fftshift(np.fft.fft2(obj)))
+        object_fft = self._return_fft_amplitude(self._fft2_object(obj))
+
+        return self._store_object_fft(cached_obj, cache_key, object_fft)
 
     @property
     def object_supersliced(self):
@@ -1129,13 +1356,61 @@ class ProbeMethodsMixin:
         else:
             probe = xp.asarray(probe, dtype=xp.complex64)
 
-        fourier_probe = xp.fft.fft2(probe)
+        sx, sy = probe.shape[-2:]
+        if sx % 2 == 0 and sy % 2 == 0:
+            # for even sizes, modulating by a checkerboard before the FFT is
+            # equivalent to fftshift-ing after it
+            checkerboard = self._return_fftshift_checkerboard((sx, sy))
+            # the modulated probe is a temporary, so it is transformed in place
+            fourier_probe = self._fft2_object(probe * checkerboard, overwrite_x=True)
+
+            if remove_initial_probe_aberrations:
+                fourier_probe *= self._return_known_aberrations_conj(shifted=True)
+
+            return fourier_probe
+
+        fourier_probe = self._fft2_object(probe)
 
         if remove_initial_probe_aberrations:
-            fourier_probe *= xp.conjugate(self._known_aberrations_array)
+            fourier_probe *= self._return_known_aberrations_conj()
 
         return xp.fft.fftshift(fourier_probe, axes=(-2, -1))
 
+    def _return_known_aberrations_conj(self, shifted=False):
+        """
+        Returns the complex conjugate of the known probe aberrations, optionally
+        shifted to the center of the array. Cached until
+        _known_aberrations_array is reassigned.
+        """
+        xp = self._xp
+        known_aberrations = self._known_aberrations_array
+
+        cache = getattr(self, "_known_aberrations_conj_cache", None)
+        if cache is None or cache[0] is not known_aberrations:
+            conj = xp.conjugate(known_aberrations)
+            cache = (known_aberrations, conj, xp.fft.fftshift(conj, axes=(-2, -1)))
+            self._known_aberrations_conj_cache = cache
+
+        return cache[2] if shifted else cache[1]
+
+    def _return_fftshift_checkerboard(self, shape):
+        """
+        Returns the (-1)**(i+j) checkerboard of shape on the calculation device.
+        This is cached, as it only depends on the probe shape.
+        """
+        xp = self._xp
+
+        cache = getattr(self, "_fftshift_checkerboard", None)
+        if cache is not None and cache[0] is xp and cache[1] == shape:
+            return cache[2]
+
+        sx, sy = shape
+        parity = (np.arange(sx)[:, None] + np.arange(sy)[None, :]) % 2
+        checkerboard = xp.asarray(1 - 2 * parity, dtype=xp.float32)
+        self._fftshift_checkerboard = (xp, shape, checkerboard)
+
+        return checkerboard
+
     def _return_fourier_probe_from_centered_probe(
         self,
         probe=None,
@@ -1310,6 +1585,7 @@ class ProbeMethodsMixin:
         W: int, optional
             if not None, sets the width of the image grid
         """
+        xp = self._xp
         asnumpy = self._asnumpy
 
         if pixelsize is None:
@@ -1337,15 +1613,15 @@ class ProbeMethodsMixin:
         else:
             if isinstance(probe, np.ndarray) and probe.ndim == 2:
                 probe = [probe]
-            probe = [
+            # single batched FFT over all probe modes
+            probe = list(
                 asnumpy(
                     self._return_fourier_probe(
-                        pr,
+                        xp.stack([xp.asarray(pr) for pr in probe]),
                         remove_initial_probe_aberrations=remove_initial_probe_aberrations,
                     )
                 )
-                for pr in probe
-            ]
+            )
 
         probe = list(partition_list(probe, W))
         probe = probe if len(probe) > 1 else probe[0]
@@ -3419,6 +3695,8 @@ class MultipleMeasurementsMethodsMixin:
 
         # reset can be True, False, or None (default)
         if reset is True:
+            self._object_fft_cache = None
+            self._fov_crop_cache = None
             self.error_iterations = []
             self._object = self._object_initial.copy()
             self._probes_all = [pr.copy() for pr in self._probes_all_initial]
@@ -25,7 +25,9 @@ def get_cross_correlation(ar, template, corrPower=1, _returnval="real"):
     )
 
 
-def get_cross_correlation_FT(ar, template_FT, corrPower=1, _returnval="real"):
+def get_cross_correlation_FT(
+    ar, template_FT, corrPower=1, _returnval="real", ar_FT=None
+):
     """
     Get the cross/phase/hybrid correlation of `ar` with `template_FT`, where
     the latter is already in Fourier space (i.e. `template_FT` is
@@ -33,18 +35,42 @@ def get_cross_correlation_FT(ar, template_FT, corrPower=1, _returnval="real"):
 
     If _returnval is 'real', returns the real-valued cross-correlation.
     Otherwise, returns the complex valued result.
+
+    If `ar_FT` is passed, it is used as `np.fft.fft2(ar)` - e.g. when the
+    caller has already transformed many arrays in a batch - and `ar` is
+    ignored.
     """
     assert _returnval in ("real", "fourier")
-    m = np.fft.fft2(ar) * template_FT
-    if corrPower != 1:
-        cc = np.abs(m) ** (corrPower) * np.exp(1j * np.angle(m))
-    else:
-        cc = m
+    if ar_FT is None:
+        ar_FT = np.fft.fft2(ar)
+    m = ar_FT * template_FT
+    cc = _hybrid_correlation(m, corrPower)
     if _returnval == "real":
         cc = np.maximum(np.real(np.fft.ifft2(cc)), 0)
     return cc
 
 
+def _hybrid_correlation(m, corrPower=1):
+    """
+    Computes the hybrid correlation `|m|**corrPower * exp(1j*angle(m))` of the
+    complex array `m` as `m * |m|**(corrPower-1)`, avoiding the intermediate
+    angle and exponential arrays. `m` is overwritten. Entries where `m` is
+    zero give 0 (or 1 if `corrPower` is 0), as for the direct expression.
+    """
+    if corrPower == 1:
+        return m
+    mag = np.abs(m)
+    nonzero = mag > 0
+    if corrPower == 0:
+        # phase correlation, m/|m|
+        np.divide(m, mag, out=m, where=nonzero)
+        m[~nonzero] = 1
+        return m
+    # |m| is zero wherever the power is skipped, so the scale is too
+    np.power(mag, corrPower - 1, out=mag, where=nonzero)
+    return np.multiply(m, mag, out=m)
+
+
 def get_shift(ar1, ar2, corrPower=1):
     """
         Determine the relative shift between a pair of arrays giving the best overlap.
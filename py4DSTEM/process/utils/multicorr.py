@@ -11,6 +11,8 @@ modified by SEZ, May 2019 to integrate with py4DSTEM utility functions
  * rewrote the matrix multiply DFT to be more pythonic
 """
 
+from functools import lru_cache
+
 import numpy as np
 
 try:
@@ -112,6 +114,72 @@ def upsampled_correlation(imageCorr, upsampleFactor, xyShift, device="cpu"):
     return xyShift
 
 
+def upsampled_correlation_batched(imageCorr, upsampleFactor, xyShifts, device="cpu"):
+    """
+    Refine several correlation peaks of imageCorr at once by DFT upsampling.
+
+    Equivalent to calling `upsampled_correlation` once for each row of
+    `xyShifts`, but builds the transformation matrices for all peaks together and
+    performs the matrix multiply DFTs as batched products, removing the
+    per-peak Python overhead.
+
+    Args:
+        imageCorr (complex valued ndarray):
+            Complex product of the FFTs of the two images to be registered,
+            as for `upsampled_correlation`
+        upsampleFactor (int):
+            Upsampling factor. Must be greater than 2.
+        xyShifts ((N,2) array):
+            Locations in original image coordinates around which to upsample
+            the FT, given to exactly half-pixel precision
+
+    Returns:
+        ((N,2) array): Refined locations of the peaks in image coordinates.
+    """
+    if device == "cpu":
+        xp = np
+    elif device == "gpu":
+        xp = cp
+
+    assert upsampleFactor > 2
+
+    xyShifts = xp.asarray(xyShifts, dtype=float).reshape(-1, 2)
+    xyShifts = xp.round(xyShifts * upsampleFactor) / upsampleFactor
+
+    globalShift = xp.fix(xp.ceil(upsampleFactor * 1.5) / 2)
+
+    upsampleCenters = globalShift - upsampleFactor * xyShifts
+
+    imageCorrUpsample = xp.conj(
+        dftUpsample_batched(
+            xp.conj(imageCorr), upsampleFactor, upsampleCenters, device=device
+        )
+    )
+
+    N, numRow, numCol = imageCorrUpsample.shape
+    ind = imageCorrUpsample.reshape(N, -1).argmax(axis=1)
+    xySubShifts = xp.stack((ind // numCol, ind % numCol), axis=1)
+
+    # add a subpixel shift via parabolic fitting, for peaks whose 3x3
+    # neighborhood lies inside the upsampled region
+    x0 = xp.clip(xySubShifts[:, 0], 1, numRow - 2)
+    y0 = xp.clip(xySubShifts[:, 1], 1, numCol - 2)
+    inside = (x0 == xySubShifts[:, 0]) & (y0 == xySubShifts[:, 1])
+    n = xp.arange(N)
+    icc = xp.real(imageCorrUpsample)
+    Ix0 = icc[n, x0, y0]
+    Ix1_, Ix1 = icc[n, x0 - 1, y0], icc[n, x0 + 1, y0]
+    Iy1_, Iy1 = icc[n, x0, y0 - 1], icc[n, x0, y0 + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx = (Ix1 - Ix1_) / (4 * Ix0 - 2 * Ix1 - 2 * Ix1_)
+        dy = (Iy1 - Iy1_) / (4 * Ix0 - 2 * Iy1 - 2 * Iy1_)
+    dxy = xp.where(inside[:, None], xp.stack((dx, dy), axis=1), 0)
+
+    xySubShifts = xySubShifts - globalShift
+
+    return xyShifts + (xySubShifts + dxy) / upsampleFactor
+
+
 def upsampleFFT(cc, device="cpu"):
     """
     Zero-padding FFT upsampling. Returns the real IFFT of the input with 2x
@@ -175,26 +243,103 @@ def dftUpsample(imageCorr, upsampleFactor, xyShift, device="cpu"):
     elif device == "gpu":
         xp = cp
 
-    imageSize = imageCorr.shape
+    # the kernels factor into a shift-independent part, which is cached, and a
+    # phase ramp set by xyShift
+    rowPhase, colPhase, rowBase, colBase = _get_dft_upsample_kernels(
+        imageCorr.shape, upsampleFactor, device=device
+    )
+    rowKern = rowBase * xp.exp(-rowPhase * xyShift[0])[None, :]
+    colKern = colBase * xp.exp(-colPhase * xyShift[1])[:, None]
+
+    imageUpsample = xp.real(rowKern @ imageCorr @ colKern)
+    return imageUpsample
+
+
+@lru_cache(maxsize=16)
+def _get_dft_upsample_kernels(imageSize, upsampleFactor, device="cpu"):
+    """
+    Returns the parts of the matrix multiply DFT kernels used by `dftUpsample`
+    which depend only on the image shape and upsampling factor. For an
+    upsampling center (x0,y0), the kernels are
+
+        rowKern = rowBase * exp(-rowPhase * x0)[None, :]
+        colKern = colBase * exp(-colPhase * y0)[:, None]
+
+    Args:
+        imageSize (2-tuple): the shape of the correlation image
+        upsampleFactor (int): the upsampling factor
+
+    Returns:
+        (4-tuple of arrays): rowPhase, colPhase, rowBase, colBase
+    """
+    if device == "cpu":
+        xp = np
+    elif device == "gpu":
+        xp = cp
+
     pixelRadius = 1.5
     numRow = np.ceil(pixelRadius * upsampleFactor)
     numCol = numRow
 
-    colKern = xp.exp(
-        (-1j * 2 * np.pi / (imageSize[1] * upsampleFactor))
-        * xp.outer(
-            (xp.fft.ifftshift((xp.arange(imageSize[1]))) - xp.floor(imageSize[1] / 2)),
-            (xp.arange(numCol) - xyShift[1]),
-        )
+    rowPhase = (-1j * 2 * np.pi / (imageSize[0] * upsampleFactor)) * (
+        xp.fft.ifftshift(xp.arange(imageSize[0])) - xp.floor(imageSize[0] / 2)
+    )
+    colPhase = (-1j * 2 * np.pi / (imageSize[1] * upsampleFactor)) * (
+        xp.fft.ifftshift(xp.arange(imageSize[1])) - xp.floor(imageSize[1] / 2)
     )
+    rowBase = xp.exp(xp.outer(xp.arange(numRow), rowPhase))
+    colBase = xp.exp(xp.outer(colPhase, xp.arange(numCol)))
 
-    rowKern = xp.exp(
-        (-1j * 2 * np.pi / (imageSize[0] * upsampleFactor))
-        * xp.outer(
-            (xp.arange(numRow) - xyShift[0]),
-            (xp.fft.ifftshift(xp.arange(imageSize[0])) - xp.floor(imageSize[0] / 2)),
-        )
+    # the arrays are shared between calls
+    if xp is np:
+        for ar in (rowPhase, colPhase, rowBase, colBase):
+            ar.flags.writeable = False
+    return rowPhase, colPhase, rowBase, colBase
+
+
+def dftUpsample_batched(imageCorr, upsampleFactor, xyShifts, device="cpu"):
+    """
+    Batched version of `dftUpsample`: performs the matrix multiply DFT around N
+    regions of imageCorr at once.
+
+    Args:
+        imageCorr (complex valued ndarray):
+            Correlation image between two images in Fourier space.
+        upsampleFactor (int):
+            Scalar integer of how much to upsample.
+        xyShifts ((N,2) array):
+            Coordinates in the UPSAMPLED GRID around which to upsample.
+
+    Returns:
+        ((N,numRow,numCol) ndarray):
+            Upsampled images from the regions around each correlation peak.
+    """
+    if device == "cpu":
+        xp = np
+    elif device == "gpu":
+        xp = cp
+
+    imageSize = imageCorr.shape
+    N = xyShifts.shape[0]
+    rowPhase, colPhase, rowBase, colBase = _get_dft_upsample_kernels(
+        imageSize, upsampleFactor, device=device
     )
 
-    imageUpsample = xp.real(rowKern @ imageCorr @ colKern)
+    # (N, numRow, imageSize[0])
+    rowKern = (
+        rowBase[None, :, :]
+        * xp.exp(-rowPhase[None, :] * xyShifts[:, 0, None])[:, None, :]
+    )
+
+    # (N, imageSize[1], numCol)
+    colKern = (
+        colBase[None, :, :]
+        * xp.exp(-colPhase[None, :] * xyShifts[:, 1, None])[:, :, None]
+    )
+
+    # a single matrix product against imageCorr for all N regions
+    rowProd = (rowKern.reshape(-1, imageSize[0]) @ imageCorr).reshape(
+        N, -1, imageSize[1]
+    )
+    imageUpsample = xp.real(rowProd @ colKern)
     return imageUpsample
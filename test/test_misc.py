@@ -22,3 +22,50 @@ def test_datacube_copy():
     x = py4DSTEM.DataCube(data=np.zeros((3, 3, 4, 4)))
     y = x.copy()
     assert isinstance(y, py4DSTEM.DataCube)
+
+
+def test_gaussian_filter_recursive():
+    """tests the recursive gaussian against scipy's FIR gaussian"""
+    from scipy.ndimage import gaussian_filter
+    from py4DSTEM.preprocess.utils import gaussian_filter_recursive
+
+    ar = np.zeros((64, 80))
+    ar[20, 30] = 1.0
+    ar[50:60, 5:15] = 0.5
+    for sigma in (2, 6):
+        ref = gaussian_filter(ar, sigma)
+        out = gaussian_filter_recursive(ar, sigma)
+        assert out.shape == ar.shape
+        assert np.allclose(out, ref, atol=0.02 * ref.max())
+
+
+def test_get_maxima_2D_large_sigma():
+    """tests that smoothing with the recursive gaussian finds the same maxima"""
+    from py4DSTEM.preprocess.utils import get_maxima_2D
+
+    ar = np.zeros((512, 512))
+    ar[100, 150] = 1.0
+    ar[300, 400] = 0.6
+    maxima = get_maxima_2D(ar, sigma=16, subpixel="pixel", maxNumPeaks=2)
+    assert list(zip(maxima["x"], maxima["y"])) == [(100, 150), (300, 400)]
+
+
+def test_upsampled_correlation_batched():
+    """tests that batched DFT upsampling matches the per-peak version"""
+    from py4DSTEM.process.utils.multicorr import (
+        upsampled_correlation,
+        upsampled_correlation_batched,
+    )
+
+    rng = np.random.default_rng(0)
+    im = np.zeros((40, 48))
+    xx, yy = np.meshgrid(np.arange(40), np.arange(48), indexing="ij")
+    for x, y in ((10.3, 12.8), (25.6, 30.1), (33.0, 5.4)):
+        im += np.exp(-((xx - x) ** 2 + (yy - y) ** 2) / 8)
+    im_FT = np.fft.fft2(im + 0.01 * rng.random(im.shape))
+    xyShifts = np.array([[10.5, 13.0], [25.5, 30.0], [33.0, 5.5]])
+
+    batched = upsampled_correlation_batched(im_FT, 16, xyShifts)
+    for i in range(len(xyShifts)):
+        single = upsampled_correlation(im_FT, 16, xyShifts[i].copy())
+        assert np.allclose(batched[i], single)
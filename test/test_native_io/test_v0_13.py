@@ -30,3 +30,14 @@ class TestV13:
             self.path,
         )
         d
+
+
+def test_v13_array_default_dims():
+    import numpy as np
+    from py4DSTEM.io.legacy.legacy13 import Array
+
+    ar = Array(np.ones((3, 4)))
+    assert [len(dim) for dim in ar.dims] == [3, 4]
+    assert np.array_equal(ar.dims[1], np.arange(4))
+    assert ar.dim_names == ["dim0", "dim1"]
+    assert ar.dim_units == ["pixels", "pixels"]
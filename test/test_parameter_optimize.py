@@ -0,0 +1,69 @@
+import copy
+import py4DSTEM
+import numpy as np
+from py4DSTEM.process.phase import SingleslicePtychography
+from py4DSTEM.process.phase.parameter_optimize import (
+    OptimizationParameter,
+    PtychographyOptimizer,
+)
+
+
+class TestPtychographyOptimizer:
+    # setup/teardown
+    def setup_class(cls):
+        # tiny synthetic datacube: a noisy bright-field disk at each scan position
+        rng = np.random.default_rng(0)
+        qx, qy = np.meshgrid(np.arange(16) - 8, np.arange(16) - 8, indexing="ij")
+        disk = (qx**2 + qy**2 < 16).astype(float)
+        data = disk[None, None] * (1 + 0.1 * rng.random((6, 6, 16, 16)))
+
+        datacube = py4DSTEM.DataCube(data=data)
+        datacube.calibration.set_R_pixel_size(1.0)
+        datacube.calibration.set_R_pixel_units("A")
+        datacube.calibration.set_Q_pixel_size(0.1)
+        datacube.calibration.set_Q_pixel_units("mrad")
+        cls.datacube = datacube
+
+    def get_optimizer(self):
+        return PtychographyOptimizer(
+            SingleslicePtychography,
+            {
+                "datacube": self.datacube,
+                "energy": 80e3,
+                "semiangle_cutoff": 4.0,
+                "device": "cpu",
+            },
+            {"force_com_rotation": 0, "force_com_transpose": False},
+            {"num_iter": 2, "step_size": OptimizationParameter(0.5, 0.1, 1.0)},
+        )
+
+    # tests
+
+    def test_deepcopy_shares_datacube(self):
+        ptycho = SingleslicePtychography(
+            datacube=self.datacube, energy=80e3, semiangle_cutoff=4.0, device="cpu"
+        ).preprocess(
+            force_com_rotation=0, force_com_transpose=False, plot_center_of_mass=False
+        )
+        ptycho_copy = copy.deepcopy(ptycho, memo={id(self.datacube): self.datacube})
+        assert ptycho_copy._datacube is ptycho._datacube
+        assert ptycho_copy._xp is ptycho._xp
+        assert ptycho_copy._amplitudes is not ptycho._amplitudes
+
+    def test_optimize_num_threads(self):
+        optimizer = self.get_optimizer()
+        optimizer.optimize(n_calls=6, n_initial_points=3, num_threads=2)
+        assert len(optimizer._skopt_result.x_iters) == 6
+        assert np.all(np.isfinite(optimizer._skopt_result.func_vals))
+
+    def test_optimize_resume(self):
+        optimizer = self.get_optimizer()
+        optimizer.optimize(n_calls=4, n_initial_points=3)
+        optimizer.optimize(n_calls=2, resume=True)
+        assert len(optimizer._skopt_result.x_iters) == 6
+
+    def test_optimize_resume_num_threads(self):
+        optimizer = self.get_optimizer()
+        optimizer.optimize(n_calls=4, n_initial_points=3, num_threads=2)
+        optimizer.optimize(n_calls=2, resume=True, num_threads=2)
+        assert len(optimizer._skopt_result.x_iters) == 6